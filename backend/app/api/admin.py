@@ -4,14 +4,16 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
+from sqlalchemy import delete
 from sqlmodel import Session, select
 
 from app.api.auth import get_current_user
 from app.core.config import settings
 from app.models import (
+    CollectionResource,
     ConfigRequestStatus,
-    ConfigValueType,
     ConfigurableValue,
+    ConfigValueType,
     Resource,
     ResourceResponse,
     User,
@@ -106,7 +108,7 @@ def get_user(
 class RoleUpdate(BaseModel):
     """Role update request."""
 
-    role: str
+    role: UserRole
 
 
 class StatusUpdate(BaseModel):
@@ -145,7 +147,7 @@ def update_user_role(
             detail="User not found",
         )
 
-    user.role = UserRole(role_update.role)
+    user.role = role_update.role
     session.add(user)
     session.commit()
     session.refresh(user)
@@ -252,10 +254,13 @@ def delete_user(
             detail="User not found",
         )
 
-    # Delete all resources by this user
-    resources = session.exec(select(Resource).where(Resource.user_id == user_id)).all()
-    for resource in resources:
-        session.delete(resource)
+    # Delete all resources by this user in one statement (no per-row load/DELETE),
+    # after their collection links, as SQLite does not enforce ON DELETE CASCADE
+    user_resource_ids = select(Resource.id).where(Resource.user_id == user_id)
+    session.exec(
+        delete(CollectionResource).where(CollectionResource.resource_id.in_(user_resource_ids))  # type: ignore[attr-defined]
+    )
+    session.exec(delete(Resource).where(Resource.user_id == user_id))
 
     # Delete user
     session.delete(user)
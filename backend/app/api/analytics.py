@@ -1,11 +1,15 @@
 """Analytics endpoints for tracking engagement and platform metrics."""
 
+from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlmodel import Session, func, select
 
 from app.api.auth import get_current_user
+from app.core.cache import TTLCache
 from app.models import (
     AnalyticsBySpecialtyResponse,
     SpecialtyStats,
@@ -26,10 +30,15 @@ from app.models import (
     UserTriedInfo,
     UserTriedResource,
 )
-from app.services.database import get_session
+from app.services.database import get_session, upsert_insert
 
 router = APIRouter(prefix="/api/v1", tags=["analytics"])
 
+# Admin dashboard roll-ups. Counters change on every view, so these are not
+# invalidated on writes; a dashboard up to a minute stale is acceptable.
+_platform_analytics_cache: TTLCache[PlatformAnalyticsResponse] = TTLCache(maxsize=1, ttl=60)
+_specialty_analytics_cache: TTLCache[AnalyticsBySpecialtyResponse] = TTLCache(maxsize=1, ttl=60)
+
 
 def get_or_create_analytics(
     resource_id: UUID,
@@ -57,6 +66,67 @@ def get_or_create_analytics(
     return analytics
 
 
+def _list_resource_history(
+    session: Session,
+    link_model: type[UserSavedResource] | type[UserTriedResource],
+    timestamp_column: Any,
+    user_id: UUID,
+    skip: int,
+    limit: int,
+) -> list[SavedResourceItem]:
+    """List a user's saved or tried resources with author info in one query.
+
+    Args:
+        session: Database session
+        link_model: UserSavedResource or UserTriedResource
+        timestamp_column: When the link was made (saved_at / tried_at)
+        user_id: User whose history to list
+        skip: Number of results to skip
+        limit: Maximum number of results
+
+    Returns:
+        Visible resources, most recent first
+    """
+    rows = session.exec(
+        select(
+            Resource.id,
+            Resource.title,
+            Resource.content_text,
+            Resource.type,
+            Resource.specialty,
+            User.id.label("author_id"),  # type: ignore[attr-defined]
+            User.full_name,
+            User.email,
+            timestamp_column,
+        )
+        .select_from(link_model)
+        .join(Resource, Resource.id == link_model.resource_id)
+        .outerjoin(User, User.id == Resource.user_id)
+        .where(link_model.user_id == user_id)
+        .where(Resource.is_hidden.is_(False))
+        .order_by(timestamp_column.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+    return [
+        SavedResourceItem(
+            id=row.id,
+            title=row.title,
+            content_text=row.content_text,
+            type=row.type.value,
+            specialty=row.specialty,
+            user={
+                "id": str(row.author_id),
+                "full_name": row.full_name,
+                "email": row.email,
+            } if row.author_id else None,
+            saved_at=row[-1],
+        )
+        for row in rows
+    ]
+
+
 # Resource Analytics Endpoints
 
 
@@ -77,9 +147,8 @@ def track_resource_view(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
@@ -123,9 +192,8 @@ def track_resource_tried(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
@@ -134,23 +202,14 @@ def track_resource_tried(
     # Get or create analytics
     analytics = get_or_create_analytics(resource_id, session)
 
-    # Check if user already tried this resource
-    existing_try = session.exec(
-        select(UserTriedResource).where(
-            (UserTriedResource.user_id == current_user.id) &
-            (UserTriedResource.resource_id == resource_id)
-        )
-    ).first()
-
-    # Only increment and track if this is the first time
-    if not existing_try:
-        # Create tracking record
-        tried = UserTriedResource(
-            user_id=current_user.id,
-            resource_id=resource_id,
-        )
-        session.add(tried)
-        # Increment tried count
+    # Record the try; the unique (user_id, resource_id) index makes repeats a no-op, so
+    # the count only increments the first time
+    result = session.exec(
+        upsert_insert(session, UserTriedResource)
+        .values(user_id=current_user.id, resource_id=resource_id, tried_at=datetime.now(UTC))
+        .on_conflict_do_nothing(index_elements=["user_id", "resource_id"])
+    )
+    if result.rowcount > 0:
         analytics.tried_count += 1
 
     session.add(analytics)
@@ -183,38 +242,35 @@ def toggle_resource_save(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
         )
 
-    # Check if already saved
-    existing = session.exec(
-        select(UserSavedResource).where(
+    # Get or create analytics
+    analytics = get_or_create_analytics(resource_id, session)
+
+    # Toggle without a pre-read: remove the save if present, otherwise insert
+    # it (the unique (user_id, resource_id) index guards against concurrent double saves)
+    removed = session.exec(
+        delete(UserSavedResource).where(
             (UserSavedResource.user_id == current_user.id)
             & (UserSavedResource.resource_id == resource_id)
         )
-    ).first()
-
-    # Get or create analytics
-    analytics = get_or_create_analytics(resource_id, session)
+    )
 
-    if existing:
-        # Remove save
-        session.delete(existing)
+    if removed.rowcount > 0:
         analytics.save_count = max(0, analytics.save_count - 1)
         is_saved = False
     else:
-        # Add save
-        saved = UserSavedResource(
-            user_id=current_user.id,
-            resource_id=resource_id,
+        inserted = session.exec(
+            upsert_insert(session, UserSavedResource)
+            .values(user_id=current_user.id, resource_id=resource_id, saved_at=datetime.now(UTC))
+            .on_conflict_do_nothing(index_elements=["user_id", "resource_id"])
         )
-        session.add(saved)
-        analytics.save_count += 1
+        analytics.save_count += inserted.rowcount
         is_saved = True
 
     session.add(analytics)
@@ -246,9 +302,8 @@ def get_resource_analytics(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
@@ -279,9 +334,8 @@ def check_resource_saved(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
@@ -319,38 +373,14 @@ def get_user_saved_resources(
     Returns:
         List of saved resources with user info
     """
-    # Get saved resource IDs
-    saved = session.exec(
-        select(UserSavedResource)
-        .where(UserSavedResource.user_id == current_user.id)
-        .order_by(UserSavedResource.saved_at.desc())  # type: ignore[attr-defined]
-        .offset(skip)
-        .limit(limit)
-    ).all()
-
-    # Fetch the actual resources
-    result = []
-    for saved_record in saved:
-        resource = session.get(Resource, saved_record.resource_id)
-        if resource and not resource.is_hidden:
-            # Get user info
-            user = session.get(User, resource.user_id)
-            saved_item = SavedResourceItem(
-                id=resource.id,
-                title=resource.title,
-                content_text=resource.content_text,
-                type=resource.type.value,
-                specialty=resource.specialty,
-                user={
-                    "id": str(user.id),
-                    "full_name": user.full_name,
-                    "email": user.email,
-                } if user else None,
-                saved_at=saved_record.saved_at,
-            )
-            result.append(saved_item)
-
-    return result
+    return _list_resource_history(
+        session,
+        UserSavedResource,
+        UserSavedResource.saved_at,
+        current_user.id,
+        skip,
+        limit,
+    )
 
 
 @router.get("/users/me/tried-resources", response_model=list[SavedResourceItem])
@@ -371,38 +401,14 @@ def get_user_tried_resources(
     Returns:
         List of tried resources with user info
     """
-    # Get tried resource IDs
-    tried = session.exec(
-        select(UserTriedResource)
-        .where(UserTriedResource.user_id == current_user.id)
-        .order_by(UserTriedResource.tried_at.desc())  # type: ignore[attr-defined]
-        .offset(skip)
-        .limit(limit)
-    ).all()
-
-    # Fetch the actual resources
-    result = []
-    for tried_record in tried:
-        resource = session.get(Resource, tried_record.resource_id)
-        if resource and not resource.is_hidden:
-            # Get user info
-            user = session.get(User, resource.user_id)
-            saved_item = SavedResourceItem(
-                id=resource.id,
-                title=resource.title,
-                content_text=resource.content_text,
-                type=resource.type.value,
-                specialty=resource.specialty,
-                user={
-                    "id": str(user.id),
-                    "full_name": user.full_name,
-                    "email": user.email,
-                } if user else None,
-                saved_at=tried_record.tried_at,
-            )
-            result.append(saved_item)
-
-    return result
+    return _list_resource_history(
+        session,
+        UserTriedResource,
+        UserTriedResource.tried_at,
+        current_user.id,
+        skip,
+        limit,
+    )
 
 
 # Platform Analytics Endpoints
@@ -432,30 +438,39 @@ def get_platform_analytics(
             detail="Only admins can view platform analytics",
         )
 
-    # Get all analytics
-    all_analytics = session.exec(select(ResourceAnalytics)).all()
-    resources = session.exec(select(Resource)).all()
-
-    # Calculate metrics
-    total_views = sum(a.view_count for a in all_analytics)
-    total_saves = sum(a.save_count for a in all_analytics)
-    total_tried = sum(a.tried_count for a in all_analytics)
-    total_forks = sum(a.fork_count for a in all_analytics)
-    total_comments = sum(a.comment_count for a in all_analytics)
+    cached = _platform_analytics_cache.get("platform")
+    if cached is not None:
+        return cached
+
+    # ResourceAnalytics is maintained incrementally on the write path, so the
+    # platform roll-up is a single aggregate over it rather than a row load
+    totals = session.exec(
+        select(
+            func.coalesce(func.sum(ResourceAnalytics.view_count), 0),
+            func.coalesce(func.sum(ResourceAnalytics.save_count), 0),
+            func.coalesce(func.sum(ResourceAnalytics.tried_count), 0),
+            func.coalesce(func.sum(ResourceAnalytics.fork_count), 0),
+            func.coalesce(func.sum(ResourceAnalytics.comment_count), 0),
+        )
+    ).one()
+    total_views, total_saves, total_tried, total_forks, total_comments = totals
+    total_resources = session.exec(select(func.count()).select_from(Resource)).one()
 
     # Find top resources
-    top_viewed = sorted(all_analytics, key=lambda a: a.view_count, reverse=True)[:5]
+    top_viewed = session.exec(
+        select(ResourceAnalytics).order_by(ResourceAnalytics.view_count.desc()).limit(5)  # type: ignore[attr-defined]
+    ).all()
 
-    return PlatformAnalyticsResponse(
+    analytics = PlatformAnalyticsResponse(
         platform_stats=PlatformStats(
-            total_resources=len(resources),
+            total_resources=total_resources,
             total_views=total_views,
             total_saves=total_saves,
             total_tried=total_tried,
             total_forks=total_forks,
             total_comments=total_comments,
-            avg_views_per_resource=total_views / len(resources) if resources else 0.0,
-            avg_saves_per_resource=total_saves / len(resources) if resources else 0.0,
+            avg_views_per_resource=total_views / total_resources if total_resources else 0.0,
+            avg_saves_per_resource=total_saves / total_resources if total_resources else 0.0,
         ),
         top_resources=[
             TopResource(
@@ -467,6 +482,9 @@ def get_platform_analytics(
             for a in top_viewed
         ],
     )
+    _platform_analytics_cache.set("platform", analytics)
+
+    return analytics
 
 
 @router.get("/admin/analytics/by-specialty", response_model=AnalyticsBySpecialtyResponse)
@@ -493,30 +511,32 @@ def get_analytics_by_specialty(
             detail="Only admins can view analytics",
         )
 
-    # Get all resources grouped by specialty
-    resources = session.exec(select(Resource)).all()
-
-    specialty_stats: dict[str, SpecialtyStats] = {}
-    for resource in resources:
-        if resource.specialty:
-            if resource.specialty not in specialty_stats:
-                specialty_stats[resource.specialty] = SpecialtyStats(
-                    count=0,
-                    total_views=0,
-                    total_saves=0,
-                )
+    cached = _specialty_analytics_cache.get("by_specialty")
+    if cached is not None:
+        return cached
+
+    # Aggregate per specialty in SQL (one query instead of one per resource)
+    rows = session.exec(
+        select(
+            Resource.specialty,
+            func.count(Resource.id),
+            func.coalesce(func.sum(ResourceAnalytics.view_count), 0),
+            func.coalesce(func.sum(ResourceAnalytics.save_count), 0),
+        )
+        .outerjoin(ResourceAnalytics, ResourceAnalytics.resource_id == Resource.id)
+        .where(Resource.specialty.is_not(None), Resource.specialty != "")  # type: ignore[union-attr]
+        .group_by(Resource.specialty)
+    ).all()
 
-            specialty_stats[resource.specialty].count += 1
+    specialty_stats = {
+        specialty: SpecialtyStats(count=count, total_views=views, total_saves=saves)
+        for specialty, count, views, saves in rows
+    }
 
-            # Get analytics
-            analytics = session.exec(
-                select(ResourceAnalytics).where(ResourceAnalytics.resource_id == resource.id)
-            ).first()
-            if analytics:
-                specialty_stats[resource.specialty].total_views += analytics.view_count
-                specialty_stats[resource.specialty].total_saves += analytics.save_count
+    analytics = AnalyticsBySpecialtyResponse(by_specialty=specialty_stats)
+    _specialty_analytics_cache.set("by_specialty", analytics)
 
-    return AnalyticsBySpecialtyResponse(by_specialty=specialty_stats)
+    return analytics
 
 
 @router.get("/resources/{resource_id}/users-tried-it", response_model=list[UserTriedInfo])
@@ -539,31 +559,22 @@ def get_users_who_tried_resource(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
         )
 
-    # Get users who tried this resource
-    tried_records = session.exec(
-        select(UserTriedResource)
+    # Get users who tried this resource, joined with their details in one query
+    rows = session.exec(
+        select(User.id, User.full_name, User.email, UserTriedResource.tried_at)
+        .join(User, User.id == UserTriedResource.user_id)
         .where(UserTriedResource.resource_id == resource_id)
         .order_by(UserTriedResource.tried_at.desc())  # type: ignore[attr-defined]
     ).all()
 
-    # Get user details
-    result = []
-    for tried_record in tried_records:
-        user = session.get(User, tried_record.user_id)
-        if user:
-            result.append(UserTriedInfo(
-                id=user.id,
-                full_name=user.full_name,
-                email=user.email,
-                tried_at=tried_record.tried_at,
-            ))
-
-    return result
+    return [
+        UserTriedInfo(id=user_id, full_name=full_name, email=email, tried_at=tried_at)
+        for user_id, full_name, email, tried_at in rows
+    ]
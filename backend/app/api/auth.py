@@ -3,7 +3,7 @@
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, status
 from pydantic import BaseModel
 from sqlmodel import Session, select
 
@@ -113,7 +113,8 @@ def get_current_user(
             detail="Invalid token",
         ) from e
 
-    user = session.exec(select(User).where(User.id == user_id)).first()
+    # Primary-key lookup goes through the session identity map first
+    user = session.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -141,12 +142,17 @@ def get_current_user(
 def register(
     request: Request,  # noqa: ARG001 - required by slowapi for rate limiting
     user_create: UserCreate,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
 ) -> UserRegistrationResponse:
     """Register a new user and send verification email.
 
+    The email is sent as a background task after the response, so
+    registration does not wait on the mail server.
+
     Args:
         user_create: User creation data
+        background_tasks: Background tasks to run after the response
         session: Database session
 
     Returns:
@@ -232,12 +238,9 @@ def register(
     session.add(verification)
     session.commit()
 
-    # Send verification email
-    try:
-        send_verification_email(new_user, verification_code)
-    except Exception as e:
-        # Log error but continue - email may fail in dev environment
-        print(f"Warning: Failed to send verification email: {e}")
+    # Send verification email after the response; send_email logs failures
+    # itself, so a failed send (e.g. in a dev environment) does not surface here
+    background_tasks.add_task(send_verification_email, new_user, verification_code)
 
     return UserRegistrationResponse(
         email=new_user.email,
@@ -315,10 +318,7 @@ def verify_email(
     session.refresh(user)
 
     # Create tokens
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
-    )
+    access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
     return TokenResponse(
@@ -385,10 +385,7 @@ def login(
         )
 
     # Create tokens
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
-    )
+    access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
     return TokenResponse(
@@ -3,14 +3,19 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, insert
 from sqlmodel import Session, select
 
 from app.api.auth import get_current_user
 from app.models import (
     Collection,
     CollectionCreate,
+    CollectionPrompt,
+    CollectionResource,
     CollectionResponse,
     CollectionUpdate,
+    Prompt,
+    Resource,
     User,
 )
 from app.services.database import get_session
@@ -18,6 +23,137 @@ from app.services.database import get_session
 router = APIRouter(prefix="/api/v1/collections", tags=["collections"])
 
 
+def _member_ids(
+    session: Session,
+    link_model: type[CollectionResource] | type[CollectionPrompt],
+    collection_ids: list[UUID],
+) -> dict[UUID, list[UUID]]:
+    """Load the member IDs of several collections in one query.
+
+    Args:
+        session: Database session
+        link_model: CollectionResource or CollectionPrompt
+        collection_ids: Collections to load members for
+
+    Returns:
+        Member IDs per collection, in collection order
+    """
+    member_column = (
+        CollectionResource.resource_id
+        if link_model is CollectionResource
+        else CollectionPrompt.prompt_id
+    )
+    rows = session.exec(
+        select(link_model.collection_id, member_column)
+        .where(link_model.collection_id.in_(collection_ids))  # type: ignore[attr-defined]
+        .order_by(link_model.collection_id, link_model.position)
+    ).all()
+
+    members: dict[UUID, list[UUID]] = {collection_id: [] for collection_id in collection_ids}
+    for collection_id, member_id in rows:
+        members[collection_id].append(member_id)
+    return members
+
+
+def _ensure_members_exist(
+    session: Session,
+    link_model: type[CollectionResource] | type[CollectionPrompt],
+    member_ids: list[UUID],
+) -> None:
+    """Raise 400 unless every member ID refers to an existing resource or prompt.
+
+    Args:
+        session: Database session
+        link_model: CollectionResource or CollectionPrompt
+        member_ids: Member IDs from the request
+
+    Raises:
+        HTTPException: If any member does not exist
+    """
+    if not member_ids:
+        return
+
+    member_model = Resource if link_model is CollectionResource else Prompt
+    found = set(
+        session.exec(select(member_model.id).where(member_model.id.in_(member_ids))).all()  # type: ignore[attr-defined]
+    )
+    missing = [str(member_id) for member_id in dict.fromkeys(member_ids) if member_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{member_model.__name__}s not found: {', '.join(missing)}",
+        )
+
+
+def _set_members(
+    session: Session,
+    link_model: type[CollectionResource] | type[CollectionPrompt],
+    collection_id: UUID,
+    member_ids: list[UUID],
+) -> None:
+    """Replace a collection's members with the given IDs (order preserved).
+
+    Args:
+        session: Database session
+        link_model: CollectionResource or CollectionPrompt
+        collection_id: Collection to update
+        member_ids: New member IDs; duplicates are dropped
+    """
+    member_key = "resource_id" if link_model is CollectionResource else "prompt_id"
+    session.exec(delete(link_model).where(link_model.collection_id == collection_id))  # type: ignore[arg-type]
+    member_ids = list(dict.fromkeys(member_ids))
+    if member_ids:
+        session.exec(
+            insert(link_model).values(
+                [
+                    {"collection_id": collection_id, member_key: member_id, "position": position}
+                    for position, member_id in enumerate(member_ids)
+                ]
+            )
+        )
+
+
+def _to_responses(session: Session, collections: list[Collection]) -> list[CollectionResponse]:
+    """Build collection responses, loading members with one query per link table.
+
+    Args:
+        session: Database session
+        collections: Collections to convert
+
+    Returns:
+        Collection responses with resource and prompt IDs
+    """
+    collection_ids = [collection.id for collection in collections]
+    resource_ids = _member_ids(session, CollectionResource, collection_ids)
+    prompt_ids = _member_ids(session, CollectionPrompt, collection_ids)
+
+    return [
+        CollectionResponse(
+            **collection.model_dump(),
+            resource_ids=resource_ids[collection.id],
+            prompt_ids=prompt_ids[collection.id],
+        )
+        for collection in collections
+    ]
+
+
+def _ensure_collection_exists(session: Session, collection_id: UUID) -> None:
+    """Raise 404 unless the collection exists.
+
+    Args:
+        session: Database session
+        collection_id: Collection ID
+
+    Raises:
+        HTTPException: If collection not found
+    """
+    if not session.exec(select(Collection.id).where(Collection.id == collection_id)).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Collection not found",
+        )
+
+
 @router.get("", response_model=list[CollectionResponse])
 def list_collections(
     skip: int = 0,
@@ -38,7 +174,7 @@ def list_collections(
         select(Collection).offset(skip).limit(limit).order_by(Collection.created_at.desc())  # type: ignore[attr-defined]
     ).all()
 
-    return [CollectionResponse.model_validate(c) for c in collections]
+    return _to_responses(session, list(collections))
 
 
 @router.get("/{collection_id}", response_model=CollectionResponse)
@@ -67,7 +203,7 @@ def get_collection(
             detail="Collection not found",
         )
 
-    return CollectionResponse.model_validate(collection)
+    return _to_responses(session, [collection])[0]
 
 
 @router.post("", response_model=CollectionResponse, status_code=status.HTTP_201_CREATED)
@@ -85,20 +221,27 @@ def create_collection(
 
     Returns:
         Created collection
+
+    Raises:
+        HTTPException: If a member resource or prompt does not exist
     """
+    _ensure_members_exist(session, CollectionResource, collection_data.resource_ids)
+    _ensure_members_exist(session, CollectionPrompt, collection_data.prompt_ids)
+
     collection = Collection(
         name=collection_data.name,
         description=collection_data.description,
         owner_id=str(current_user.id),
-        resource_ids=collection_data.resource_ids,
-        prompt_ids=collection_data.prompt_ids,
     )
 
     session.add(collection)
+    session.flush()
+    _set_members(session, CollectionResource, collection.id, collection_data.resource_ids)
+    _set_members(session, CollectionPrompt, collection.id, collection_data.prompt_ids)
     session.commit()
     session.refresh(collection)
 
-    return CollectionResponse.model_validate(collection)
+    return _to_responses(session, [collection])[0]
 
 
 @router.patch("/{collection_id}", response_model=CollectionResponse)
@@ -120,7 +263,7 @@ def update_collection(
         Updated collection
 
     Raises:
-        HTTPException: If collection not found or not authorized
+        HTTPException: If collection not found or not authorized, or a member does not exist
     """
     collection = session.exec(
         select(Collection).where(Collection.id == collection_id)
@@ -138,21 +281,26 @@ def update_collection(
             detail="Not authorized to update this collection",
         )
 
+    if collection_data.resource_ids is not None:
+        _ensure_members_exist(session, CollectionResource, collection_data.resource_ids)
+    if collection_data.prompt_ids is not None:
+        _ensure_members_exist(session, CollectionPrompt, collection_data.prompt_ids)
+
     # Update fields
     if collection_data.name is not None:
         collection.name = collection_data.name
     if collection_data.description is not None:
         collection.description = collection_data.description
     if collection_data.resource_ids is not None:
-        collection.resource_ids = collection_data.resource_ids
+        _set_members(session, CollectionResource, collection.id, collection_data.resource_ids)
     if collection_data.prompt_ids is not None:
-        collection.prompt_ids = collection_data.prompt_ids
+        _set_members(session, CollectionPrompt, collection.id, collection_data.prompt_ids)
 
     session.add(collection)
     session.commit()
     session.refresh(collection)
 
-    return CollectionResponse.model_validate(collection)
+    return _to_responses(session, [collection])[0]
 
 
 @router.delete("/{collection_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -187,6 +335,8 @@ def delete_collection(
             detail="Not authorized to delete this collection",
         )
 
+    _set_members(session, CollectionResource, collection.id, [])
+    _set_members(session, CollectionPrompt, collection.id, [])
     session.delete(collection)
     session.commit()
 
@@ -222,7 +372,7 @@ def subscribe_to_collection(
     session.commit()
     session.refresh(collection)
 
-    return CollectionResponse.model_validate(collection)
+    return _to_responses(session, [collection])[0]
 
 
 @router.get("/{collection_id}/prompts", response_model=list[UUID])
@@ -242,16 +392,9 @@ def get_collection_prompts(
     Raises:
         HTTPException: If collection not found
     """
-    collection = session.exec(
-        select(Collection).where(Collection.id == collection_id)
-    ).first()
-    if not collection:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Collection not found",
-        )
+    _ensure_collection_exists(session, collection_id)
 
-    return collection.prompt_ids
+    return _member_ids(session, CollectionPrompt, [collection_id])[collection_id]
 
 
 @router.get("/{collection_id}/resources", response_model=list[UUID])
@@ -271,13 +414,6 @@ def get_collection_resources(
     Raises:
         HTTPException: If collection not found
     """
-    collection = session.exec(
-        select(Collection).where(Collection.id == collection_id)
-    ).first()
-    if not collection:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Collection not found",
-        )
+    _ensure_collection_exists(session, collection_id)
 
-    return collection.resource_ids
+    return _member_ids(session, CollectionResource, [collection_id])[collection_id]
@@ -29,9 +29,8 @@ def get_resource_comments(
     Raises:
         HTTPException: If resource not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
@@ -66,9 +65,8 @@ def create_comment(
     Raises:
         HTTPException: If resource not found or parent comment not found
     """
-    # Verify resource exists
-    resource = session.exec(select(Resource).where(Resource.id == resource_id)).first()
-    if not resource:
+    # Verify resource exists (id only; skips the text/JSON columns)
+    if session.exec(select(Resource.id).where(Resource.id == resource_id)).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resource not found",
@@ -3,10 +3,13 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete
 from sqlmodel import Session, select
 
 from app.api.auth import get_current_user
 from app.models import (
+    SHARING_LEVEL_VALUES,
+    CollectionPrompt,
     Prompt,
     PromptCreate,
     PromptResponse,
@@ -42,19 +45,16 @@ def list_prompts(
     """
     query = select(Prompt)
 
-    # Filter by sharing level
-    if sharing_level:
-        try:
-            level = SharingLevel(sharing_level)
-            if level == SharingLevel.PRIVATE and current_user:
-                # Only show user's own private prompts
-                query = query.where(
-                    (Prompt.sharing_level == SharingLevel.PRIVATE) & (Prompt.user_id == current_user.id)
-                )
-            else:
-                query = query.where(Prompt.sharing_level == level)
-        except ValueError:
-            pass
+    # Filter by sharing level (unknown levels are ignored)
+    if sharing_level is not None and sharing_level in SHARING_LEVEL_VALUES:
+        level = SharingLevel(sharing_level)
+        if level == SharingLevel.PRIVATE and current_user:
+            # Only show user's own private prompts
+            query = query.where(
+                (Prompt.sharing_level == SharingLevel.PRIVATE) & (Prompt.user_id == current_user.id)
+            )
+        else:
+            query = query.where(Prompt.sharing_level == level)
 
     # Apply pagination
     query = query.offset(skip).limit(limit).order_by(Prompt.created_at.desc())  # type: ignore[attr-defined]
@@ -215,6 +215,8 @@ def delete_prompt(
             detail="Not authorized to delete this prompt",
         )
 
+    # SQLite does not enforce the link table's ON DELETE CASCADE
+    session.exec(delete(CollectionPrompt).where(CollectionPrompt.prompt_id == prompt_id))  # type: ignore[arg-type]
     session.delete(prompt)
     session.commit()
 
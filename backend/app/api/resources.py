@@ -2,29 +2,105 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import Text, cast, delete, exists, func, or_, true
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.elements import ColumnElement
 from sqlmodel import Session, select
 
 from app.api.auth import get_current_user
 from app.core.config import settings
 from app.models import (
+    CollectionResource,
     Resource,
     ResourceAnalytics,
     ResourceAnalyticsResponse,
     ResourceCreate,
+    ResourceListItem,
     ResourceResponse,
     ResourceStatus,
     ResourceType,
     ResourceUpdate,
     ResourceWithAuthor,
+    Subscription,
     User,
+    UserRole,
 )
 from app.services.auto_tagger import extract_keywords
-from app.services.database import get_session
+from app.services.database import get_session, session_scope
 from app.services.email_service import notify_new_request, notify_new_solution
 
 router = APIRouter(prefix=f"{settings.api_v1_str}/resources", tags=["resources"])
 
+# Columns needed by the list/browse view; detail-only fields (content_meta,
+# shadow_description, workflow_steps, example_prompt, ...) are left out.
+RESOURCE_LIST_COLUMNS = (
+    Resource.id,
+    Resource.user_id,
+    Resource.parent_id,
+    Resource.type,
+    Resource.status,
+    Resource.title,
+    Resource.content_text,
+    Resource.quick_summary,
+    Resource.is_anonymous,
+    Resource.is_verified,
+    Resource.is_hidden,
+    Resource.system_tags,
+    Resource.user_tags,
+    Resource.shadow_tags,
+    Resource.specialty,
+    Resource.tools_used,
+    Resource.time_saved_value,
+    Resource.time_saved_frequency,
+    Resource.created_at,
+    Resource.updated_at,
+)
+
+
+def _json_array_contains(
+    session: Session, column: ColumnElement, value: str
+) -> ColumnElement[bool]:
+    """Build a condition testing whether a JSON array column contains a value.
+
+    Uses an index-friendly ``@>`` on Postgres (JSONB) and ``json_each`` on SQLite,
+    so tags are compared as whole array elements rather than substrings.
+
+    Args:
+        session: Database session (its bind decides the dialect)
+        column: JSON column holding a list of strings
+        value: Element to look for
+
+    Returns:
+        SQL boolean condition
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(column, JSONB).contains([value])
+    elements = func.json_each(column).table_valued("value")
+    return exists().where(elements.c.value == value)
+
+
+def _json_object_has_any_key(
+    session: Session, column: ColumnElement, keys: list[str]
+) -> ColumnElement[bool]:
+    """Build a condition testing whether a JSON object column has any of the keys.
+
+    Uses the GIN-indexable ``?|`` operator on Postgres (JSONB) and ``json_extract``
+    on SQLite, where a missing key yields NULL.
+
+    Args:
+        session: Database session (its bind decides the dialect)
+        column: JSON column holding an object
+        keys: Keys to look for
+
+    Returns:
+        SQL boolean condition
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(column, JSONB).has_any(array(keys, type_=Text))
+    return or_(*(func.json_extract(column, f"$.{key}").isnot(None) for key in keys))
+
 
 class TagSuggestion:
     """Tag suggestions response."""
@@ -44,7 +120,7 @@ class TagSuggestion:
         self.user_tags = user_tags or []
 
 
-@router.get("", response_model=list[ResourceWithAuthor])
+@router.get("", response_model=list[ResourceListItem])
 def list_resources(
     type_filter: ResourceType | None = Query(None, alias="type"),
     tag: str | None = Query(None),
@@ -59,7 +135,7 @@ def list_resources(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=1000),
     session: Session = Depends(get_session),
-) -> list[ResourceWithAuthor]:
+) -> list[ResourceListItem]:
     """Get list of resources with advanced filtering and author information.
 
     Args:
@@ -79,7 +155,14 @@ def list_resources(
     Returns:
         List of resources with author info matching filters
     """
-    query = select(Resource).where(Resource.is_hidden.is_(False))
+    # Author and analytics come from joins in the same query (analytics is
+    # unique per resource, so the outer join cannot duplicate rows)
+    query = (
+        select(*RESOURCE_LIST_COLUMNS, User.full_name, User.email, ResourceAnalytics)
+        .join(User, User.id == Resource.user_id)
+        .outerjoin(ResourceAnalytics, ResourceAnalytics.resource_id == Resource.id)
+        .where(Resource.is_hidden.is_(False))
+    )
 
     # Basic filters
     if type_filter:
@@ -89,11 +172,14 @@ def list_resources(
         query = query.where(Resource.status == status_filter)
 
     if tag:
-        # Filter by tag (contains)
+        # Filter by exact tag in any of the three tag lists
         query = query.where(
-            (Resource.system_tags.contains([tag]))
-            | (Resource.user_tags.contains([tag]))
-            | (Resource.shadow_tags.contains([tag]))
+            or_(
+                *(
+                    _json_array_contains(session, column, tag)
+                    for column in (Resource.system_tags, Resource.user_tags, Resource.shadow_tags)
+                )
+            )
         )
 
     if search:
@@ -112,25 +198,17 @@ def list_resources(
         # Parse comma-separated tool categories (e.g., "LLM,CUSTOM_APP")
         # tools_used is a JSON dict: {"LLM": ["Claude"], "CUSTOM_APP": ["Talk-Buddy"]}
         # Filter resources that have any of the specified categories
-        from sqlalchemy import func, or_
         tool_categories = [t.strip() for t in tools.split(",")]
-        # Build OR condition: check if any of the specified categories exist as keys
-        # Using json_extract to check if the key exists in the JSON object
-        conditions = []
-        for category in tool_categories:
-            # Check if the category key exists in tools_used dict using json_extract
-            # json_extract returns NULL if the key doesn't exist, not NULL if it does
-            conditions.append(func.json_extract(Resource.tools_used, f'$.{category}').isnot(None))
-        if conditions:
-            query = query.where(or_(*conditions))
+        query = query.where(_json_object_has_any_key(session, Resource.tools_used, tool_categories))
 
     if professional_roles:
         # Parse comma-separated professional roles (e.g., "Educator,Researcher")
-        # Filter resources by the creator's professional role
-        from sqlalchemy import or_
+        # Filter resources by the creator's professional roles. The author row is
+        # already joined for the name/email columns, so filter it directly.
         roles = [r.strip() for r in professional_roles.split(",")]
-        # Join with User table to filter by professional_role
-        query = query.join(User, Resource.user_id == User.id).where(User.professional_role.in_(roles))
+        query = query.where(
+            or_(*(_json_array_contains(session, User.professional_roles, role) for role in roles))
+        )
 
     if min_time_saved is not None:
         query = query.where(Resource.time_saved_value >= min_time_saved)  # type: ignore[operator]
@@ -145,42 +223,29 @@ def list_resources(
         # Sort by most tried (would join with analytics in production)
         query = query.order_by(Resource.created_at.desc())
 
-    resources = session.exec(query.offset(skip).limit(limit)).all()
+    rows = session.exec(query.offset(skip).limit(limit)).all()
 
-    # Include user information and analytics for each resource
+    # Include author information and analytics for each resource
     result = []
-    for resource in resources:
-        # Get only the fields we need for author info with a targeted query
-        user_data = session.exec(
-            select(User.id, User.full_name, User.email).where(User.id == resource.user_id)
-        ).first()
-
-        # Get analytics for the resource
-        analytics = session.exec(
-            select(ResourceAnalytics).where(ResourceAnalytics.resource_id == resource.id)
-        ).first()
-
-        if user_data:
-            # Build response data with analytics
-            response_data = ResourceResponse.model_validate(resource).model_dump()
-            response_data["analytics"] = (
-                ResourceAnalyticsResponse.model_validate(analytics).model_dump()
-                if analytics
-                else None
-            )
-
-            # Respect anonymity: show author name only if not anonymous
-            user_id, full_name, email = user_data
-            author_name = "Faculty Member" if resource.is_anonymous else full_name
-            author_email = None if resource.is_anonymous else email
+    for row in rows:
+        resource_data = {column.key: row._mapping[column] for column in RESOURCE_LIST_COLUMNS}
+        analytics = row.ResourceAnalytics
 
-            resource_with_author = ResourceWithAuthor(
-                **response_data,
+        # Respect anonymity: show author name only if not anonymous
+        author_name = "Faculty Member" if row.is_anonymous else row.full_name
+        author_email = None if row.is_anonymous else row.email
+
+        result.append(
+            ResourceListItem.model_construct(
+                **resource_data,
+                analytics=(
+                    ResourceAnalyticsResponse.model_validate(analytics) if analytics else None
+                ),
                 author_name=author_name,
                 author_email=author_email,
-                author_id=user_id,
+                author_id=row.user_id,
             )
-            result.append(resource_with_author)
+        )
 
     return result
 
@@ -292,16 +357,70 @@ def get_resource_solutions(
     return solutions
 
 
+def process_new_resource(bind: Engine | Connection, resource_id: UUID) -> None:
+    """Auto-tag a newly created resource and send notifications.
+
+    Runs as a background task after the create response has been sent, using
+    its own session on the same database as the request.
+
+    Args:
+        bind: Engine (or connection) the resource was created on
+        resource_id: ID of the new resource
+    """
+    with session_scope(bind) as session:
+        resource = session.get(Resource, resource_id)
+        if not resource:
+            return
+
+        resource.system_tags = extract_keywords(f"{resource.title} {resource.content_text}")
+        session.add(resource)
+        session.commit()
+
+        # If this is a solution, notify the original requester
+        if resource.parent_id:
+            parent = session.get(Resource, resource.parent_id)
+            if parent and parent.type == ResourceType.REQUEST:
+                requester = session.get(User, parent.user_id)
+                if requester:
+                    notify_new_solution(resource, requester)
+
+        # If this is a new request, notify subscribers to related tags
+        if resource.type == ResourceType.REQUEST and resource.system_tags:
+            # Fetch the distinct users subscribed to any of the tags in one query,
+            # skipping those who turned request notifications off (default on)
+            subscribers = list(
+                session.exec(
+                    select(User)
+                    .join(Subscription, Subscription.user_id == User.id)
+                    .where(Subscription.tag.in_(resource.system_tags))
+                    .where(
+                        func.coalesce(
+                            User.notification_prefs["notify_requests"].as_boolean(), true()
+                        )
+                    )
+                    .distinct()
+                ).all()
+            )
+
+            if subscribers:
+                notify_new_request(resource, subscribers)
+
+
 @router.post("", response_model=ResourceResponse, status_code=status.HTTP_201_CREATED)
 def create_resource(
     resource_data: ResourceCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ) -> ResourceResponse:
     """Create a new resource.
 
+    System tags are extracted and notifications sent in a background task,
+    so the returned resource does not include system tags yet.
+
     Args:
         resource_data: Resource creation data
+        background_tasks: Background task queue for post-response work
         current_user: Current authenticated user
         session: Database session
 
@@ -312,6 +431,7 @@ def create_resource(
         HTTPException: If invalid parent_id or parent not a request
     """
     # Validate parent_id if provided
+    parent = None
     if resource_data.parent_id:
         parent = session.get(Resource, resource_data.parent_id)
 
@@ -327,8 +447,7 @@ def create_resource(
                 detail="Solutions can only be added to requests",
             )
 
-    # Create resource
-    # Auto-populate user_area from current user's area
+    # Create resource (user_area keeps its model default; users have no area field)
     new_resource = Resource(
         user_id=current_user.id,
         type=resource_data.type,
@@ -337,54 +456,19 @@ def create_resource(
         is_anonymous=resource_data.is_anonymous,
         parent_id=resource_data.parent_id,
         content_meta=resource_data.content_meta,
-        user_area=current_user.area,  # Auto-assign from user's area
     )
-
     session.add(new_resource)
-    session.commit()
-    session.refresh(new_resource)
 
-    # Extract keywords asynchronously (for now, do it synchronously)
-    # TODO: Move to background task
-    tags = extract_keywords(f"{new_resource.title} {new_resource.content_text}")
-    new_resource.system_tags = tags
+    # If this is a solution, mark the parent request as solved in the same commit
+    if parent:
+        parent.status = ResourceStatus.SOLVED
+        session.add(parent)
 
-    session.add(new_resource)
     session.commit()
     session.refresh(new_resource)
 
-    # If this is a solution, update parent request status and notify requester
-    if new_resource.parent_id:
-        parent = session.get(Resource, new_resource.parent_id)
-        if parent and parent.type == ResourceType.REQUEST:
-            parent.status = ResourceStatus.SOLVED
-            session.add(parent)
-            session.commit()
-
-            # Notify the original requester (background task would be ideal)
-            requester = session.get(User, parent.user_id)
-            if requester:
-                notify_new_solution(new_resource, requester)
-
-    # If this is a new request, notify subscribers to related tags
-    if new_resource.type == ResourceType.REQUEST and new_resource.system_tags:
-        from app.models import Subscription
-
-        # Find all subscriptions matching any of the tags
-        subscriptions: list[Subscription] = []
-        for tag in new_resource.system_tags:
-            tag_subscriptions = session.exec(
-                select(Subscription).where(Subscription.tag == tag)
-            ).all()
-            subscriptions.extend(tag_subscriptions)
-
-        if subscriptions:
-            # Get unique users and notify them (background task would be ideal)
-            subscriber_ids = {sub.user_id for sub in subscriptions}
-            subscribers: list[User] = [
-                u for uid in subscriber_ids if (u := session.get(User, uid)) is not None
-            ]
-            notify_new_request(new_resource, subscribers)
+    # Keyword extraction and notifications run after the response is sent
+    background_tasks.add_task(process_new_resource, session.get_bind(), new_resource.id)
 
     return new_resource
 
@@ -410,8 +494,6 @@ def update_resource(
     Raises:
         HTTPException: If not owner/admin or resource not found
     """
-    from app.models import UserRole
-
     resource = session.get(Resource, resource_id)
 
     if not resource:
@@ -463,8 +545,6 @@ def delete_resource(
     Raises:
         HTTPException: If not owner/admin or resource not found
     """
-    from app.models import UserRole
-
     resource = session.get(Resource, resource_id)
 
     if not resource:
@@ -500,5 +580,7 @@ def delete_resource(
                 parent.status = ResourceStatus.OPEN
                 session.add(parent)
 
+    # SQLite does not enforce the link table's ON DELETE CASCADE
+    session.exec(delete(CollectionResource).where(CollectionResource.resource_id == resource_id))  # type: ignore[arg-type]
     session.delete(resource)
     session.commit()
@@ -1,19 +1,33 @@
 """Subscription and notification preference endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+import hashlib
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, update
 from sqlmodel import Session, select
 
 from app.api.auth import get_current_user
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.responses import ORJSON_OPTIONS
 from app.models import NotificationPreferences, Subscription, SubscriptionResponse, User
-from app.services.database import get_session
+from app.services.database import get_session, upsert_insert
 
 router = APIRouter(
     prefix=f"{settings.api_v1_str}/subscriptions",
     tags=["subscriptions"],
 )
 
+# Most tags one batch request may subscribe to; keeps the multi-row INSERT
+# well under SQLite's bound-parameter limit
+MAX_BATCH_TAGS = 100
+
+# Serialized subscription list and its ETag per user, invalidated on writes
+_subscriptions_cache: TTLCache[tuple[str, bytes]] = TTLCache(maxsize=10000, ttl=300)
+
 
 class SubscribeRequest(BaseModel):
     """Subscribe to tag request."""
@@ -21,6 +35,12 @@ class SubscribeRequest(BaseModel):
     tag: str
 
 
+class BulkSubscribeRequest(BaseModel):
+    """Subscribe to several tags request."""
+
+    tags: list[str] = Field(max_length=MAX_BATCH_TAGS)
+
+
 class NotificationPrefs(BaseModel):
     """Notification preferences."""
 
@@ -28,6 +48,25 @@ class NotificationPrefs(BaseModel):
     notify_solutions: bool
 
 
+def _insert_subscriptions(session: Session, user_id: UUID, tags: list[str]) -> int:
+    """Insert subscriptions in one statement, skipping tags already subscribed to.
+
+    Args:
+        session: Database session
+        user_id: Subscribing user ID
+        tags: Tags to subscribe to (must not be empty)
+
+    Returns:
+        Number of new subscription rows inserted
+    """
+    result = session.exec(
+        upsert_insert(session, Subscription)
+        .values([{"user_id": user_id, "tag": tag} for tag in tags])
+        .on_conflict_do_nothing(index_elements=["user_id", "tag"])
+    )
+    return result.rowcount
+
+
 @router.post("/subscribe", response_model=SubscriptionResponse, status_code=status.HTTP_201_CREATED)
 def subscribe(
     subscribe_req: SubscribeRequest,
@@ -47,31 +86,44 @@ def subscribe(
     Raises:
         HTTPException: If already subscribed
     """
-    # Check if already subscribed
-    existing = session.exec(
-        select(Subscription).where(
-            (Subscription.user_id == current_user.id)
-            & (Subscription.tag == subscribe_req.tag)
-        )
-    ).first()
-
-    if existing:
+    # Insert relies on the unique (user_id, tag) index instead of a pre-check
+    if not _insert_subscriptions(session, current_user.id, [subscribe_req.tag]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Already subscribed to this tag",
         )
 
-    # Create subscription
-    subscription = Subscription(
-        user_id=current_user.id,
-        tag=subscribe_req.tag,
-    )
-
-    session.add(subscription)
     session.commit()
-    session.refresh(subscription)
+    _subscriptions_cache.pop(current_user.id)
+
+    return SubscriptionResponse(user_id=current_user.id, tag=subscribe_req.tag)
 
-    return subscription
+
+@router.post("/subscribe-batch", response_model=list[SubscriptionResponse])
+def subscribe_batch(
+    subscribe_req: BulkSubscribeRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> list[SubscriptionResponse]:
+    """Subscribe to several tags with a single multi-row INSERT.
+
+    Tags are stripped and deduplicated; blank tags are dropped, and tags the
+    user is already subscribed to are skipped rather than rejected.
+
+    Args:
+        subscribe_req: Subscription request with tags
+        current_user: Current authenticated user
+        session: Database session
+
+    Returns:
+        Subscription details for each requested tag
+    """
+    tags = list(dict.fromkeys(tag.strip() for tag in subscribe_req.tags if tag.strip()))
+    if tags and _insert_subscriptions(session, current_user.id, tags):
+        session.commit()
+        _subscriptions_cache.pop(current_user.id)
+
+    return [SubscriptionResponse(user_id=current_user.id, tag=tag) for tag in tags]
 
 
 @router.delete("/unsubscribe/{tag}", status_code=status.HTTP_204_NO_CONTENT)
@@ -90,42 +142,65 @@ def unsubscribe(
     Raises:
         HTTPException: If not subscribed
     """
-    subscription = session.exec(
-        select(Subscription).where(
+    result = session.exec(
+        delete(Subscription).where(
             (Subscription.user_id == current_user.id)
             & (Subscription.tag == tag)
         )
-    ).first()
+    )
 
-    if not subscription:
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Not subscribed to this tag",
         )
 
-    session.delete(subscription)
     session.commit()
+    _subscriptions_cache.pop(current_user.id)
 
 
 @router.get("", response_model=list[SubscriptionResponse])
 def get_subscriptions(
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
-) -> list[SubscriptionResponse]:
+) -> Response:
     """Get current user's subscriptions.
 
+    Returns 304 Not Modified when the client's If-None-Match header matches
+    the ETag of the current subscription list. The list is serialized
+    directly with orjson; response_model is kept for the OpenAPI schema only.
+
     Args:
+        request: Incoming request (for If-None-Match)
         current_user: Current authenticated user
         session: Database session
 
     Returns:
-        List of subscriptions
+        List of subscriptions, or an empty 304 response
     """
-    subscriptions = session.exec(
-        select(Subscription).where(Subscription.user_id == current_user.id)
-    ).all()
+    cached = _subscriptions_cache.get(current_user.id)
+    if cached is None:
+        tags = session.exec(
+            select(Subscription.tag)
+            .where(Subscription.user_id == current_user.id)
+            .order_by(Subscription.tag)
+        ).all()
+        digest = hashlib.blake2b("\n".join(tags).encode(), digest_size=16).hexdigest()
+        body = orjson.dumps(
+            [{"user_id": current_user.id, "tag": tag} for tag in tags],
+            option=ORJSON_OPTIONS,
+        )
+        cached = (f'W/"{digest}"', body)
+        _subscriptions_cache.set(current_user.id, cached)
+
+    etag, body = cached
 
-    return subscriptions
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (value.strip() for value in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.patch("/notify-prefs", response_model=NotificationPreferences)
@@ -144,16 +219,17 @@ def update_notification_prefs(
     Returns:
         Updated notification preferences
     """
-    current_user.notification_prefs = {
-        "notify_requests": prefs.notify_requests,
-        "notify_solutions": prefs.notify_solutions,
-    }
-
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
-
-    return NotificationPreferences(
+    new_prefs = NotificationPreferences(
         notify_requests=prefs.notify_requests,
         notify_solutions=prefs.notify_solutions,
     )
+
+    # Single UPDATE; the response is built from the input, so no reload is needed
+    session.exec(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(notification_prefs=new_prefs.model_dump())
+    )
+    session.commit()
+
+    return new_prefs
@@ -1,5 +1,6 @@
 """Application configuration from environment variables."""
 
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +22,14 @@ class Settings(BaseSettings):
     # This ensures the database is created in the backend directory,
     # regardless of where the application is run from
     database_url: str = f"sqlite:///{Path(__file__).parent.parent.parent / 'ai_exchange.db'}"
+    # Create tables and seed configurable values at startup. Disable when the
+    # schema and seed data are provisioned by a separate one-shot deploy step.
+    init_db_on_startup: bool = True
+    # Connection pool for non-SQLite databases
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 3600  # seconds; recycles connections before server-side timeouts
 
     # Authentication
     allowed_domains: list[str] = ["curtin.edu.au"]
@@ -28,6 +37,9 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"  # JWT algorithm (HS256, HS512, RS256, etc.)
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    # Argon2 cost parameters; tests lower these via PASSWORD_HASH_* env vars
+    password_hash_rounds: int = 3
+    password_hash_memory_kib: int = 65536
 
     # Email Configuration - Flexible Provider Support
     email_provider: str = "dev"  # Options: dev, gmail, sendgrid, custom, curtin
@@ -75,4 +87,17 @@ class Settings(BaseSettings):
     rate_limit_write: str = "30/minute"
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once.
+
+    Usable as a FastAPI dependency (``Depends(get_settings)``); tests can call
+    ``get_settings.cache_clear()`` to pick up changed environment variables.
+
+    Returns:
+        Application settings
+    """
+    return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,134 @@
+"""Lightweight CORS middleware for a fixed list of allowed origins."""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers browsers may always send without them being explicitly allowed
+SAFELISTED_HEADERS = frozenset({"accept", "accept-language", "content-language", "content-type"})
+
+
+class StaticCORSMiddleware:
+    """ASGI CORS middleware with headers precomputed at startup.
+
+    Behaves like Starlette's CORSMiddleware configured with explicit origin,
+    method and header lists and ``allow_credentials=True``, but matches
+    origins against a frozenset of raw header bytes and appends prebuilt
+    header tuples instead of re-deriving them on every request. Preflight
+    responses list fixed methods/headers so browsers can cache them for
+    ``max_age`` seconds.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: list[str],
+        allow_methods: list[str],
+        allow_headers: list[str],
+        max_age: int = 600,
+    ) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Downstream ASGI application
+            allow_origins: Exact origins allowed to make cross-origin requests
+            allow_methods: HTTP methods allowed on cross-origin requests
+            allow_headers: Request headers allowed on cross-origin requests
+            max_age: Seconds browsers may cache a preflight response
+        """
+        self.app = app
+        self._origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        methods = sorted({method.upper() for method in allow_methods} | {"HEAD", "OPTIONS"})
+        headers = sorted({header.lower() for header in allow_headers} | SAFELISTED_HEADERS)
+        self._methods = frozenset(method.encode("latin-1") for method in methods)
+        self._headers = frozenset(headers)
+        self._simple_headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self._preflight_headers = [
+            (b"access-control-allow-methods", ", ".join(methods).encode("latin-1")),
+            (b"access-control-allow-headers", ", ".join(headers).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI call.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, request_method, request_headers, send)
+            return
+
+        if origin not in self._origins:
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = [(b"access-control-allow-origin", origin), *self._simple_headers]
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(
+        self,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: bytes | None,
+        send: Send,
+    ) -> None:
+        """Answer a CORS preflight request without calling the application.
+
+        Args:
+            origin: Value of the Origin request header
+            request_method: Value of Access-Control-Request-Method
+            request_headers: Value of Access-Control-Request-Headers, if sent
+            send: ASGI send channel
+        """
+        errors = []
+        if origin not in self._origins:
+            errors.append("origin")
+        if request_method not in self._methods:
+            errors.append("method")
+        if request_headers and not self._headers.issuperset(
+            header.strip() for header in request_headers.decode("latin-1").lower().split(",")
+        ):
+            errors.append("headers")
+
+        if errors:
+            status, body = 400, f"Disallowed CORS {', '.join(errors)}".encode("latin-1")
+            headers = list(self._preflight_headers)
+        else:
+            status, body = 200, b"OK"
+            headers = [(b"access-control-allow-origin", origin), *self._preflight_headers]
+
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
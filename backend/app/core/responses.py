@@ -0,0 +1,47 @@
+"""Custom response classes for API endpoints."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# UUIDs and datetimes are serialized natively by orjson (in C); naive datetimes
+# are treated as UTC and rendered with a "Z" suffix.
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_UUID | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback serializer for types orjson does not handle natively.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON-serializable representation of the object
+
+    Raises:
+        TypeError: If the object type is not supported
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson using native UUID/datetime handling."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Render content to JSON bytes.
+
+        Args:
+            content: Response content
+
+        Returns:
+            Encoded JSON
+        """
+        return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
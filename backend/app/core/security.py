@@ -1,23 +1,36 @@
 """Security utilities for authentication and authorization."""
 
-from datetime import UTC, datetime, timedelta
+import time
+from datetime import timedelta
+from functools import lru_cache
 from typing import Any
 
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
-from pydantic import ValidationError
 
 from app.core.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
-# JWT configuration (algorithm comes from settings)
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.password_hash_rounds,
+    argon2__memory_cost=settings.password_hash_memory_kib,
+)
+
+# JWT configuration (algorithm comes from settings). The key is encoded once
+# here rather than on every sign/verify call.
 ALGORITHM = settings.algorithm
+_SECRET = settings.secret_key.encode()
+_ALGORITHMS = (ALGORITHM,)
+
+# Token lifetimes in seconds; "exp" is written as an integer epoch
+ACCESS_TOKEN_TTL_SECONDS = settings.access_token_expire_minutes * 60
+REFRESH_TOKEN_TTL_SECONDS = settings.refresh_token_expire_days * 86400
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt.
+    """Hash a password using argon2.
 
     Args:
         password: Plain text password
@@ -54,43 +67,52 @@ def create_access_token(
     Returns:
         Encoded JWT token
     """
-    to_encode = data.copy()
-
-    if expires_delta:
-        expire = datetime.now(UTC) + expires_delta
-    else:
-        expire = datetime.now(UTC) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
+    ttl = ACCESS_TOKEN_TTL_SECONDS if expires_delta is None else int(expires_delta.total_seconds())
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.secret_key,
+    return jwt.encode(
+        {**data, "exp": int(time.time()) + ttl},
+        _SECRET,
         algorithm=ALGORITHM,
     )
 
-    return encoded_jwt
 
-
-def decode_token(token: str) -> dict[str, Any] | None:
-    """Decode and verify a JWT token.
+@lru_cache(maxsize=4096)
+def _decode_token_cached(token: str) -> dict[str, Any] | None:
+    """Verify a JWT token once and remember the result for the raw token string.
 
     Args:
         token: JWT token to decode
 
     Returns:
-        Decoded token data or None if invalid
+        Decoded token data or None if invalid, expired or missing "exp"
     """
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token,
-            settings.secret_key,
-            algorithms=[ALGORITHM],
+            _SECRET,
+            algorithms=_ALGORITHMS,
+            options={"require": ["exp"]},
         )
-        return payload
-    except (JWTError, ValidationError):
+    except jwt.InvalidTokenError:
+        return None
+
+
+def decode_token(token: str) -> dict[str, Any] | None:
+    """Decode and verify a JWT token.
+
+    Signature checks are cached per token, so clients reusing a bearer token
+    only pay for verification once; expiry is re-checked on every call.
+
+    Args:
+        token: JWT token to decode
+
+    Returns:
+        Decoded token data or None if invalid, expired or missing "exp"
+    """
+    payload = _decode_token_cached(token)
+    if payload is None or payload["exp"] <= time.time():
         return None
+    return dict(payload)
 
 
 def create_refresh_token(data: dict[str, Any]) -> str:
@@ -102,16 +124,8 @@ def create_refresh_token(data: dict[str, Any]) -> str:
     Returns:
         Encoded JWT refresh token
     """
-    to_encode = data.copy()
-    expire = datetime.now(UTC) + timedelta(
-        days=settings.refresh_token_expire_days
-    )
-    to_encode.update({"exp": expire, "type": "refresh"})
-
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.secret_key,
+    return jwt.encode(
+        {**data, "exp": int(time.time()) + REFRESH_TOKEN_TTL_SECONDS, "type": "refresh"},
+        _SECRET,
         algorithm=ALGORITHM,
     )
-
-    return encoded_jwt
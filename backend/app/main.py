@@ -7,7 +7,6 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -29,10 +28,13 @@ from app.api import (
     subscriptions,
 )
 from app.core.config import settings
+from app.core.cors import StaticCORSMiddleware
 from app.core.rate_limiter import limiter
+from app.core.responses import ORJSONResponse
 from app.services.config import ConfigService
-from app.services.database import engine, get_session
-from sqlmodel import Session
+from app.services.database import engine, get_session, session_scope
+from app.services.email_provider import get_email_provider
+from app.services.migrations import upgrade_schema
 
 # Configure logging
 logging.basicConfig(level=settings.log_level)
@@ -42,19 +44,28 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     """Lifespan context manager for startup and shutdown events."""
-    # Startup: Create tables
     logger.info("Starting up The AI Exchange API...")
-    SQLModel.metadata.create_all(engine)
-    logger.info("Database tables created/verified")
-
-    # Seed configurable values from defaults.yaml
-    logger.info("Seeding configurable values...")
-    with Session(engine) as session:
-        try:
-            ConfigService.seed_database(session)
-            logger.info("Configurable values seeded successfully")
-        except Exception as e:
-            logger.warning(f"Could not seed configurable values: {e}")
+
+    # Fail fast on an unsupported EMAIL_PROVIDER instead of on the first send
+    get_email_provider()
+
+    if settings.init_db_on_startup:
+        # Startup: Create tables
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as connection:
+            upgrade_schema(connection)
+        logger.info("Database tables created/verified")
+
+        # Seed configurable values from defaults.yaml
+        logger.info("Seeding configurable values...")
+        with session_scope() as session:
+            try:
+                ConfigService.seed_database(session)
+                logger.info("Configurable values seeded successfully")
+            except Exception as e:
+                logger.warning(f"Could not seed configurable values: {e}")
+    else:
+        logger.info("Skipping table creation and seeding (INIT_DB_ON_STARTUP=false)")
 
     yield
 
@@ -67,6 +78,7 @@ app = FastAPI(
     description="Internal platform for sharing and discovering AI use cases",
     version="0.1.0",
     openapi_url=f"{settings.api_v1_str}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -100,13 +112,14 @@ app.add_middleware(
     ],
 )
 
-# Add CORS middleware
+# Add CORS middleware (origins and headers are precomputed once). Methods and
+# headers are listed explicitly so browsers can cache preflights for a day.
 app.add_middleware(
-    CORSMiddleware,
+    StaticCORSMiddleware,
     allow_origins=settings.allowed_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["authorization", "content-type", "if-none-match"],
+    max_age=86400,
 )
 
 
@@ -167,5 +180,5 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=settings.debug,
     )
@@ -1,13 +1,38 @@
 """Database models for The AI Exchange."""
 
+import os
+import time
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, text
+from sqlalchemy import column as sa_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Column, DateTime, Field, SQLModel, Text
 
+# JSON columns are stored as binary JSONB on Postgres (GIN-indexable, no
+# re-parsing on access) and as plain JSON text on SQLite
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def uuid7() -> UUID:
+    """Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The leading 48 bits are the Unix time in milliseconds, so new keys append
+    to the end of the primary-key index instead of landing at random pages.
+
+    Returns:
+        New UUIDv7
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    rand_a = rand >> 68  # 12 bits
+    rand_b = rand & ((1 << 62) - 1)  # 62 bits
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b
+    return UUID(int=value)
+
 
 class UserRole(str, Enum):
     """User system roles."""
@@ -128,6 +153,10 @@ class SharingLevel(str, Enum):
     PUBLIC = "PUBLIC"
 
 
+# Raw values for validating untyped input without constructing the Enum
+SHARING_LEVEL_VALUES = frozenset(level.value for level in SharingLevel)
+
+
 class ToolCategory(str, Enum):
     """Categories for AI and related tools."""
 
@@ -151,7 +180,7 @@ class User(SQLModel, table=True):
     professional_roles: list[str] = Field(
         default=[ProfessionalRole.EDUCATOR],
         description="Professional roles (Educator, Researcher, Professional)",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     is_active: bool = Field(default=True)
     is_verified: bool = Field(default=False)
@@ -159,14 +188,14 @@ class User(SQLModel, table=True):
     specialties: list[str] = Field(
         default=[],
         description="User's professional specialties (keys from ConfigurableValue)",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     notification_prefs: dict[str, Any] = Field(
         default={
             "notify_requests": True,
             "notify_solutions": False,
         },
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
@@ -253,7 +282,37 @@ class EmailVerification(SQLModel, table=True):
 class Resource(SQLModel, table=True):
     """Resource model for requests, use cases, prompts, and policies."""
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    # Composite indexes matching the browse feed (is_hidden [+ type] ordered by
+    # created_at) and the solutions list (parent_id + is_hidden by created_at).
+    # The per-type feed and open-requests indexes are partial, covering only
+    # visible rows (open requests: Postgres only, as SQLite can't match the
+    # bound type/status parameters against the predicate).
+    __table_args__ = (
+        Index("ix_resource_hidden_created", "is_hidden", "created_at"),
+        Index(
+            "ix_resource_feed_visible",
+            "type",
+            "created_at",
+            postgresql_where=sa_column("is_hidden").is_(False),
+            sqlite_where=sa_column("is_hidden").is_(False),
+        ),
+        Index(
+            "ix_resource_open_requests",
+            "created_at",
+            postgresql_where=text("type = 'REQUEST' AND status = 'OPEN' AND is_hidden IS false"),
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_resource_parent_hidden_created", "parent_id", "is_hidden", "created_at"),
+        Index("ix_resource_forked_from", "forked_from_id"),
+        # GIN indexes for the tag (@>) and tool category (?|) filters; Postgres only
+        *(
+            Index(f"ix_resource_{column}_gin", column, postgresql_using="gin").ddl_if(
+                dialect="postgresql"
+            )
+            for column in ("system_tags", "user_tags", "shadow_tags", "tools_used")
+        ),
+    )
+
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id", index=True)
     parent_id: UUID | None = Field(
         default=None,
@@ -273,7 +332,7 @@ class Resource(SQLModel, table=True):
     content_meta: dict[str, Any] = Field(
         default={},
         description="Flexible metadata (Model Used, Tools, etc.)",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     is_anonymous: bool = Field(default=False, index=True)
     is_verified: bool = Field(default=False)
@@ -281,17 +340,17 @@ class Resource(SQLModel, table=True):
     system_tags: list[str] = Field(
         default=[],
         description="Auto-generated by YAKE + optional LLM",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     user_tags: list[str] = Field(
         default=[],
         description="Manually added by author",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     shadow_tags: list[str] = Field(
         default=[],
         description="Admin-provided tags",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     # Metadata fields
     specialty: str | None = Field(
@@ -309,13 +368,13 @@ class Resource(SQLModel, table=True):
     tools_used: dict[str, list[str]] = Field(
         default={},
         description="AI and related tools by category. e.g., {'LLM': ['Claude', 'ChatGPT'], 'CUSTOM_APP': ['Talk-Buddy']}",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     # Collaborators field - list of email addresses of people involved in this project
     collaborators: list[str] = Field(
         default=[],
         description="Email addresses of collaborators involved in this idea (editable). First email is primary contact.",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     time_saved_value: float | None = Field(
         default=None,
@@ -328,7 +387,7 @@ class Resource(SQLModel, table=True):
     evidence_of_success: list[str] = Field(
         default=[],
         description="feedback, quantifiable, peer_reviewed, department_approved",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     # Prompt forking support
     is_fork: bool = Field(default=False, description="True if this is a fork")
@@ -347,7 +406,7 @@ class Resource(SQLModel, table=True):
     workflow_steps: list[str] = Field(
         default=[],
         description="Step-by-step workflow instructions",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     example_prompt: str | None = Field(
         default=None,
@@ -381,6 +440,10 @@ class Resource(SQLModel, table=True):
 class Subscription(SQLModel, table=True):
     """Subscription model for tag-based notifications."""
 
+    # A named unique index rather than a constraint, so that upgrade_schema can
+    # add the same index to databases created before it existed
+    __table_args__ = (Index("uq_subscription_user_tag", "user_id", "tag", unique=True),)
+
     id: int | None = Field(default=None, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id", index=True)
     tag: str = Field(index=True)
@@ -393,7 +456,9 @@ class Subscription(SQLModel, table=True):
 class Comment(SQLModel, table=True):
     """Comment model for discussions on resources."""
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    __table_args__ = (Index("ix_comment_resource_created", "resource_id", "created_at"),)
+
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     resource_id: UUID = Field(foreign_key="resource.id", index=True)
     parent_comment_id: UUID | None = Field(
         default=None,
@@ -420,7 +485,7 @@ class Comment(SQLModel, table=True):
 class Prompt(SQLModel, table=True):
     """Prompt model for prompt library."""
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id", index=True)
     title: str = Field(index=True)
     prompt_text: str = Field(sa_column=Column(Text))
@@ -428,7 +493,7 @@ class Prompt(SQLModel, table=True):
     variables: list[str] = Field(
         default=[],
         description="Template variables like {{course}}, {{tone}}",
-        sa_column=Column(JSON),
+        sa_column=Column(JSONType),
     )
     sharing_level: SharingLevel = Field(default=SharingLevel.PRIVATE)
     is_fork: bool = Field(default=False, description="True if forked from another prompt")
@@ -457,20 +522,10 @@ class Prompt(SQLModel, table=True):
 class Collection(SQLModel, table=True):
     """Collection model for curated groups of prompts and resources."""
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     name: str = Field(index=True)
     description: str | None = Field(default=None, sa_column=Column(Text))
     owner_id: str = Field(description="User ID or 'SYSTEM' for official collections")
-    resource_ids: list[UUID] = Field(
-        default=[],
-        description="List of resource IDs in collection",
-        sa_column=Column(JSON),
-    )
-    prompt_ids: list[UUID] = Field(
-        default=[],
-        description="List of prompt IDs in collection",
-        sa_column=Column(JSON),
-    )
     subscriber_count: int = Field(default=0, description="Number of subscribers")
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(UTC),
@@ -486,6 +541,34 @@ class Collection(SQLModel, table=True):
         return f"Collection(id={self.id}, name={self.name})"
 
 
+class CollectionResource(SQLModel, table=True):
+    """Link table of the resources in a collection."""
+
+    collection_id: UUID = Field(foreign_key="collection.id", primary_key=True, ondelete="CASCADE")
+    resource_id: UUID = Field(
+        foreign_key="resource.id", primary_key=True, index=True, ondelete="CASCADE"
+    )
+    position: int = Field(default=0, description="Order of the resource within the collection")
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"CollectionResource(collection_id={self.collection_id}, resource_id={self.resource_id})"
+
+
+class CollectionPrompt(SQLModel, table=True):
+    """Link table of the prompts in a collection."""
+
+    collection_id: UUID = Field(foreign_key="collection.id", primary_key=True, ondelete="CASCADE")
+    prompt_id: UUID = Field(
+        foreign_key="prompt.id", primary_key=True, index=True, ondelete="CASCADE"
+    )
+    position: int = Field(default=0, description="Order of the prompt within the collection")
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"CollectionPrompt(collection_id={self.collection_id}, prompt_id={self.prompt_id})"
+
+
 class ResourceAnalytics(SQLModel, table=True):
     """Analytics model for tracking resource engagement."""
 
@@ -512,6 +595,11 @@ class ResourceAnalytics(SQLModel, table=True):
 class UserSavedResource(SQLModel, table=True):
     """Model tracking which users saved which resources."""
 
+    __table_args__ = (
+        Index("uq_saved_user_resource", "user_id", "resource_id", unique=True),
+        Index("ix_usersavedresource_user_saved", "user_id", "saved_at"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id", index=True)
     resource_id: UUID = Field(foreign_key="resource.id", index=True)
@@ -529,6 +617,12 @@ class UserSavedResource(SQLModel, table=True):
 class UserTriedResource(SQLModel, table=True):
     """Model tracking which users tried which resources."""
 
+    __table_args__ = (
+        Index("uq_tried_user_resource", "user_id", "resource_id", unique=True),
+        Index("ix_usertriedresource_user_tried", "user_id", "tried_at"),
+        Index("ix_usertriedresource_resource_tried", "resource_id", "tried_at"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id", index=True)
     resource_id: UUID = Field(foreign_key="resource.id", index=True)
@@ -706,6 +800,35 @@ class ResourceWithAuthor(ResourceResponse):
     author_id: UUID
 
 
+class ResourceListItem(SQLModel):
+    """Resource summary with author information for list/browse views."""
+
+    id: UUID
+    user_id: UUID
+    parent_id: UUID | None
+    type: ResourceType
+    status: ResourceStatus
+    title: str
+    content_text: str
+    quick_summary: str | None
+    is_anonymous: bool
+    is_verified: bool
+    is_hidden: bool
+    system_tags: list[str]
+    user_tags: list[str]
+    shadow_tags: list[str]
+    specialty: str | None
+    tools_used: dict[str, list[str]]
+    time_saved_value: float | None
+    time_saved_frequency: str | None
+    created_at: datetime
+    updated_at: datetime
+    analytics: "ResourceAnalyticsResponse | None" = None
+    author_name: str
+    author_email: str | None = None
+    author_id: UUID
+
+
 class SubscriptionCreate(SQLModel):
     """Subscription creation schema."""
 
@@ -1031,3 +1154,10 @@ class UserRegistrationResponse(SQLModel):
 
     email: str
     message: str
+
+
+# Resolve the forward references to ResourceAnalyticsResponse now so the
+# validators are built at import time rather than on the first request
+ResourceResponse.model_rebuild()
+ResourceWithAuthor.model_rebuild()
+ResourceListItem.model_rebuild()
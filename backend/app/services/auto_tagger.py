@@ -1,20 +1,33 @@
 """Auto-tagging service using YAKE and optional LLM."""
 
 import logging
-
-import yake
+from functools import lru_cache
+from typing import Any
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Initialize YAKE keyword extractor
-kw_extractor = yake.KeywordExtractor(
-    lan="en",
-    n=3,  # n-grams up to 3 words
-    top=5,  # Return top 5 keywords
-    features=None,
-)
+
+@lru_cache(maxsize=1)
+def get_kw_extractor() -> Any:
+    """Build the YAKE keyword extractor on first use.
+
+    YAKE is the heaviest import in the app, and keywords are only extracted
+    in the background after a resource is created. Deferring the import keeps
+    it off the startup path.
+
+    Returns:
+        Shared YAKE KeywordExtractor instance
+    """
+    import yake
+
+    return yake.KeywordExtractor(
+        lan="en",
+        n=3,  # n-grams up to 3 words
+        top=5,  # Return top 5 keywords
+        features=None,
+    )
 
 
 def extract_keywords_yake(text: str) -> list[str]:
@@ -27,7 +40,7 @@ def extract_keywords_yake(text: str) -> list[str]:
         List of keywords
     """
     try:
-        keywords = kw_extractor.extract_keywords(text)
+        keywords = get_kw_extractor().extract_keywords(text)
         # YAKE returns list of (keyword, score) tuples
         return [kw for kw, _ in keywords]
     except Exception as e:
@@ -1,33 +1,133 @@
 """Database connection and session management."""
 
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from typing import Any
 
+import orjson
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, create_engine
 
 from app.core.config import settings
 
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON column values with orjson.
+
+    Args:
+        value: Column value
+
+    Returns:
+        JSON text
+    """
+    return orjson.dumps(value).decode()
+
+
+# JSON columns (tags, content_meta, tools_used, ...) are encoded/decoded with
+# orjson instead of the stdlib json module
+JSON_ENGINE_KWARGS: dict[str, Any] = {
+    "json_serializer": _json_serializer,
+    "json_deserializer": orjson.loads,
+}
+
 # Create engine with appropriate settings based on database URL
 if "sqlite" in settings.database_url:
-    # SQLite specific settings
+    # SQLite specific settings. StaticPool keeps a single shared connection, so
+    # requests do not pay a per-request connect. Handlers stay sync (run in the
+    # threadpool) because every router shares this sync Session.
     engine = create_engine(
         settings.database_url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
+        **JSON_ENGINE_KWARGS,
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+        """Tune SQLite journaling and caching on each new connection.
+
+        Args:
+            dbapi_connection: Raw sqlite3 connection
+            _connection_record: Pool connection record (unused)
+        """
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers proceed during a write; with synchronous=NORMAL a
+        # commit no longer fsyncs (only checkpoints do), and the database
+        # stays consistent after a crash
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Keep temporary tables and sort spills in memory
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        # Memory-map up to 256 MiB of the file so reads skip read() syscalls
+        cursor.execute("PRAGMA mmap_size=268435456")
+        # 64 MiB page cache (negative values are KiB)
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
 else:
-    # PostgreSQL or other databases
+    # PostgreSQL or other databases: explicitly sized QueuePool; pre-ping
+    # detects dropped connections before a request uses them
     engine = create_engine(
         settings.database_url,
         echo=settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+        **JSON_ENGINE_KWARGS,
     )
 
 
 def get_session() -> Generator[Session, None, None]:
     """Get database session for dependency injection.
 
+    FastAPI caches dependencies per request, so the auth dependency and the
+    handler already share this one session. Objects are not expired on
+    commit: handlers that need server-side values call ``refresh()``
+    explicitly, and everything else avoids a reload SELECT after commit.
+
     Yields:
         Database session
     """
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         yield session
+
+
+@contextmanager
+def session_scope(bind: Engine | Connection | None = None) -> Iterator[Session]:
+    """Open a session for code running outside a request.
+
+    Endpoints use ``Depends(get_session)``; background tasks, startup hooks
+    and scripts use ``with session_scope() as session:`` so the session is
+    always closed and its connection returned to the pool.
+
+    Args:
+        bind: Engine or connection to use (defaults to the app engine)
+
+    Yields:
+        Database session
+    """
+    with Session(bind or engine, expire_on_commit=False) as session:
+        yield session
+
+
+def upsert_insert(session: Session, table: Any) -> PostgresqlInsert | SqliteInsert:
+    """Build a dialect-specific INSERT that supports ``on_conflict_do_nothing``.
+
+    Args:
+        session: Database session (its bind decides the dialect)
+        table: Model class or table to insert into
+
+    Returns:
+        INSERT construct for the session's database
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql_insert(table)
+    return sqlite_insert(table)
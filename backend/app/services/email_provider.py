@@ -1,18 +1,24 @@
 """Email provider factory and implementations for flexible email delivery."""
 
-import smtplib
+import logging
+import threading
 from abc import ABC, abstractmethod
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import settings
 
-try:
+logger = logging.getLogger(__name__)
+
+# smtplib, email.mime and requests are imported where a provider first needs
+# them, so the dev provider never pays for loading them (ssl, urllib3, ...)
+if TYPE_CHECKING:
+    import smtplib
+    import ssl
+    from email.mime.text import MIMEText
+
     import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
 
 
 class EmailProvider(ABC):
@@ -41,38 +47,153 @@ class EmailProvider(ABC):
         """
         pass
 
+    def send_bulk(
+        self,
+        messages: list[tuple[str, str, str]],
+        from_email: str | None = None,
+        from_name: str | None = None,
+    ) -> list[bool]:
+        """Send several emails.
 
-class DevEmailProvider(EmailProvider):
-    """Development email provider - logs to console (no actual sending)."""
+        The default sends them one at a time; SMTP providers override this to
+        reuse a single connection for the whole batch.
 
-    def send_email(
+        Args:
+            messages: (to_email, subject, body) for each email
+            from_email: Sender email address
+            from_name: Sender name
+
+        Returns:
+            Whether each message was sent, in order
+        """
+        return [
+            self.send_email(to_email, subject, body, from_email, from_name)
+            for to_email, subject, body in messages
+        ]
+
+    def send_personalized(
         self,
-        to_email: str,
         subject: str,
         body: str,
+        recipients: list[tuple[str, dict[str, str]]],
         from_email: str | None = None,
         from_name: str | None = None,
-    ) -> bool:
-        """Log email to console for development."""
-        from_email = from_email or settings.mail_from
-        from_name = from_name or settings.mail_from_name
-
-        print(
-            f"\n{'='*70}\n"
-            f"[DEV EMAIL]\n"
-            f"{'='*70}\n"
-            f"From: {from_name} <{from_email}>\n"
-            f"To: {to_email}\n"
-            f"Subject: {subject}\n"
-            f"{'='*70}\n"
-            f"{body}\n"
-            f"{'='*70}\n"
+    ) -> list[bool]:
+        """Send one email to many recipients with per-recipient substitutions.
+
+        Placeholders in the body (e.g. ``-name-``) are replaced with each
+        recipient's values. The default renders every email and calls
+        ``send_bulk``; SendGrid sends the template and substitutions instead.
+
+        Args:
+            subject: Email subject
+            body: Email body containing the placeholders
+            recipients: (to_email, {placeholder: value}) for each recipient
+            from_email: Sender email address
+            from_name: Sender name
+
+        Returns:
+            Whether each recipient's email was sent, in order
+        """
+        return self.send_bulk(
+            [(to_email, subject, substitute(body, values)) for to_email, values in recipients],
+            from_email,
+            from_name,
         )
-        return True
 
 
-class SMTPEmailProvider(EmailProvider):
-    """Generic SMTP email provider for custom mail servers."""
+def substitute(text: str, values: dict[str, str]) -> str:
+    """Replace each placeholder in text with its value.
+
+    Args:
+        text: Text containing placeholders
+        values: Placeholder to value mapping
+
+    Returns:
+        Text with placeholders replaced
+    """
+    for placeholder, value in values.items():
+        text = text.replace(placeholder, value)
+    return text
+
+
+@lru_cache(maxsize=1)
+def _ssl_context() -> "ssl.SSLContext":
+    """Return the TLS context shared by every SMTP connection.
+
+    Building a default context loads the CA store and cipher list, so it is
+    done once per process instead of on every connect.
+
+    Returns:
+        Default client-side SSL context
+    """
+    import ssl
+
+    return ssl.create_default_context()
+
+
+@lru_cache(maxsize=8)
+def _from_header(from_name: str, from_email: str) -> str:
+    """Format the From header; senders rarely vary, so results are cached.
+
+    Args:
+        from_name: Sender name
+        from_email: Sender email address
+
+    Returns:
+        Header value in "Name <email>" form
+    """
+    return f"{from_name} <{from_email}>"
+
+
+def _address_message(
+    msg: "MIMEText",
+    to_email: str,
+    subject: str,
+    from_header: str,
+) -> "MIMEText":
+    """Set the headers of an already-encoded HTML message for one recipient.
+
+    The message is a single text/html part (there is no plain-text
+    alternative, so no multipart wrapper). Sends happen one at a time, so
+    the same encoded message is re-addressed for every recipient of a body.
+
+    Args:
+        msg: Encoded HTML message
+        to_email: Recipient email address
+        subject: Email subject
+        from_header: Formatted From header (see ``_from_header``)
+
+    Returns:
+        The same message, ready to send
+    """
+    for name, value in (("Subject", subject), ("From", from_header), ("To", to_email)):
+        del msg[name]
+        msg[name] = value
+    return msg
+
+
+class SMTPBatchEmailProvider(EmailProvider):
+    """Base for SMTP providers: one connection (TLS + login) per batch."""
+
+    label = "SMTP"
+
+    @abstractmethod
+    def _open(self) -> "smtplib.SMTP":
+        """Open an SMTP connection to the provider's server.
+
+        Returns:
+            Connected (not yet authenticated) SMTP client
+        """
+
+    @abstractmethod
+    def _login(self, smtp: "smtplib.SMTP", from_email: str) -> None:
+        """Upgrade to TLS if needed and authenticate.
+
+        Args:
+            smtp: Connection returned by ``_open``
+            from_email: Sender email address (some servers log in with it)
+        """
 
     def send_email(
         self,
@@ -82,42 +203,50 @@ class SMTPEmailProvider(EmailProvider):
         from_email: str | None = None,
         from_name: str | None = None,
     ) -> bool:
-        """Send email via SMTP server."""
-        try:
-            from_email = from_email or settings.mail_from
-            from_name = from_name or settings.mail_from_name
+        """Send a single email over a new SMTP connection."""
+        return self.send_bulk([(to_email, subject, body)], from_email, from_name)[0]
 
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{from_name} <{from_email}>"
-            msg["To"] = to_email
-
-            msg.attach(MIMEText(body, "html"))
-
-            # Connect and send
-            if settings.use_ssl:
-                smtp = smtplib.SMTP_SSL(settings.smtp_server, settings.smtp_port)
-            else:
-                smtp = smtplib.SMTP(settings.smtp_server, settings.smtp_port)
+    def send_bulk(
+        self,
+        messages: list[tuple[str, str, str]],
+        from_email: str | None = None,
+        from_name: str | None = None,
+    ) -> list[bool]:
+        """Send several emails over one SMTP connection.
 
-            if settings.use_tls:
-                smtp.starttls()
+        A failure for one recipient does not stop the rest of the batch.
+        """
+        from email.mime.text import MIMEText
 
-            if settings.smtp_user and settings.smtp_password:
-                smtp.login(settings.smtp_user, settings.smtp_password)
+        from_email = from_email or settings.mail_from
+        from_header = _from_header(from_name or settings.mail_from_name, from_email)
+        results = [False] * len(messages)
 
-            smtp.send_message(msg)
-            smtp.quit()
+        # Encode each distinct body once (charset + transfer encoding)
+        encoded: dict[str, "MIMEText"] = {}
 
-            return True
-        except Exception as e:
-            print(f"Error sending email via SMTP: {e}")
-            return False
+        try:
+            # SMTP.__exit__ sends QUIT and closes the socket, even if login
+            # or a send raises
+            with self._open() as smtp:
+                self._login(smtp, from_email)
+                for i, (to_email, subject, body) in enumerate(messages):
+                    try:
+                        msg = encoded.get(body)
+                        if msg is None:
+                            msg = encoded[body] = MIMEText(body, "html")
+                        smtp.send_message(_address_message(msg, to_email, subject, from_header))
+                        results[i] = True
+                    except Exception:
+                        logger.exception("Error sending email via %s to %s", self.label, to_email)
+        except Exception:
+            logger.exception("Error sending email via %s", self.label)
+
+        return results
 
 
-class GmailEmailProvider(EmailProvider):
-    """Gmail email provider using app-specific password."""
+class DevEmailProvider(EmailProvider):
+    """Development email provider - logs at DEBUG level (no actual sending)."""
 
     def send_email(
         self,
@@ -127,83 +256,140 @@ class GmailEmailProvider(EmailProvider):
         from_email: str | None = None,
         from_name: str | None = None,
     ) -> bool:
-        """Send email via Gmail SMTP."""
-        try:
-            if not settings.gmail_app_password:
-                print("Error: GMAIL_APP_PASSWORD not configured")
-                return False
-
-            from_email = from_email or settings.mail_from
-            from_name = from_name or settings.mail_from_name
-
-            # Create message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{from_name} <{from_email}>"
-            msg["To"] = to_email
-
-            msg.attach(MIMEText(body, "html"))
-
-            # Connect to Gmail SMTP
-            smtp = smtplib.SMTP_SSL("smtp.gmail.com", 465)
-            smtp.login(from_email, settings.gmail_app_password)
-            smtp.send_message(msg)
-            smtp.quit()
-
-            return True
-        except Exception as e:
-            print(f"Error sending email via Gmail: {e}")
-            return False
+        """Log email for development (set LOG_LEVEL=DEBUG to see it)."""
+        # %-style arguments are only formatted if DEBUG is enabled
+        logger.debug(
+            "DEV EMAIL from=%s <%s> to=%s subject=%s\n%s",
+            from_name or settings.mail_from_name,
+            from_email or settings.mail_from,
+            to_email,
+            subject,
+            body,
+        )
+        return True
+
+
+class SMTPEmailProvider(SMTPBatchEmailProvider):
+    """Generic SMTP email provider for custom mail servers."""
+
+    label = "SMTP"
+
+    def _open(self) -> "smtplib.SMTP":
+        """Connect to the configured SMTP server."""
+        import smtplib
+
+        if settings.use_ssl:
+            return smtplib.SMTP_SSL(settings.smtp_server, settings.smtp_port, context=_ssl_context())
+        return smtplib.SMTP(settings.smtp_server, settings.smtp_port)
+
+    def _login(self, smtp: "smtplib.SMTP", from_email: str) -> None:  # noqa: ARG002
+        """Start TLS if configured and log in with the SMTP credentials."""
+        if settings.use_tls:
+            smtp.starttls(context=_ssl_context())
+
+        if settings.smtp_user and settings.smtp_password:
+            smtp.login(settings.smtp_user, settings.smtp_password)
+
+
+class GmailEmailProvider(SMTPBatchEmailProvider):
+    """Gmail email provider using app-specific password."""
+
+    label = "Gmail"
+
+    def _open(self) -> "smtplib.SMTP":
+        """Connect to Gmail SMTP."""
+        if not settings.gmail_app_password:
+            raise RuntimeError("GMAIL_APP_PASSWORD not configured")
+
+        import smtplib
+
+        return smtplib.SMTP_SSL("smtp.gmail.com", 465, context=_ssl_context())
+
+    def _login(self, smtp: "smtplib.SMTP", from_email: str) -> None:
+        """Log in with the sender address and app password."""
+        smtp.login(from_email, settings.gmail_app_password)
 
 
 class SendGridEmailProvider(EmailProvider):
     """SendGrid email provider using API key."""
 
-    def send_email(
+    url = "https://api.sendgrid.com/v3/mail/send"
+    # SendGrid's limit on personalizations per mail/send request
+    max_personalizations = 1000
+
+    # Shared across sends so HTTPS connections are kept alive and reused
+    _session: "requests.Session | None" = None
+    # send_bulk's worker threads may all ask for the session at once
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls) -> "requests.Session":
+        """Return the pooled HTTP session, creating it once on first use."""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+                    cls._session = session
+        return cls._session
+
+    @staticmethod
+    def _sender(from_email: str | None, from_name: str | None) -> dict[str, str]:
+        """Build the "from" object once per send, falling back to the defaults."""
+        return {
+            "email": from_email or settings.mail_from,
+            "name": from_name or settings.mail_from_name,
+        }
+
+    def _is_configured(self) -> bool:
+        """Check that requests is installed and an API key is set."""
+        try:
+            import requests  # noqa: F401
+        except ImportError:
+            logger.error("requests module not installed (required for SendGrid)")
+            return False
+
+        if not settings.sendgrid_api_key:
+            logger.error("SENDGRID_API_KEY not configured")
+            return False
+
+        return True
+
+    def _post(
         self,
         to_email: str,
         subject: str,
         body: str,
-        from_email: str | None = None,
-        from_name: str | None = None,
+        sender: dict[str, str],
     ) -> bool:
-        """Send email via SendGrid API."""
-        try:
-            if not HAS_REQUESTS:
-                print("Error: requests module not installed (required for SendGrid)")
-                return False
-
-            if not settings.sendgrid_api_key:
-                print("Error: SENDGRID_API_KEY not configured")
-                return False
-
-            from_email = from_email or settings.mail_from
-            from_name = from_name or settings.mail_from_name
+        """Send one email through the SendGrid API."""
+        return self._post_payload(
+            {
+                "personalizations": [{"to": [{"email": to_email}]}],
+                "from": sender,
+                "subject": subject,
+                "content": [{"type": "text/html", "value": body}],
+            }
+        )
 
-            url = "https://api.sendgrid.com/v3/mail/send"
+    def _post_payload(self, data: dict[str, Any]) -> bool:
+        """POST a mail/send payload over the pooled session."""
+        try:
             headers = {
                 "Authorization": f"Bearer {settings.sendgrid_api_key}",
                 "Content-Type": "application/json",
             }
 
-            data = {
-                "personalizations": [{"to": [{"email": to_email}]}],
-                "from": {"email": from_email, "name": from_name},
-                "subject": subject,
-                "content": [{"type": "text/html", "value": body}],
-            }
-
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            response = self._get_session().post(self.url, json=data, headers=headers, timeout=10)
 
             return response.status_code in [200, 202]
-        except Exception as e:
-            print(f"Error sending email via SendGrid: {e}")
+        except Exception:
+            logger.exception("Error sending email via SendGrid")
             return False
 
-
-class CurtinEmailProvider(EmailProvider):
-    """Curtin University email provider (SMTP wrapper)."""
-
     def send_email(
         self,
         to_email: str,
@@ -212,57 +398,142 @@ class CurtinEmailProvider(EmailProvider):
         from_email: str | None = None,
         from_name: str | None = None,
     ) -> bool:
-        """Send email via Curtin SMTP server."""
-        try:
-            from_email = from_email or settings.mail_from
-            from_name = from_name or settings.mail_from_name
+        """Send email via SendGrid API."""
+        if not self._is_configured():
+            return False
 
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = f"{from_name} <{from_email}>"
-            msg["To"] = to_email
+        return self._post(to_email, subject, body, self._sender(from_email, from_name))
 
-            msg.attach(MIMEText(body, "html"))
+    def send_bulk(
+        self,
+        messages: list[tuple[str, str, str]],
+        from_email: str | None = None,
+        from_name: str | None = None,
+    ) -> list[bool]:
+        """Send several emails concurrently over the pooled session.
 
-            # Curtin uses TLS on port 587
-            smtp = smtplib.SMTP(settings.smtp_server, settings.smtp_port)
-            smtp.starttls()
+        The API is stateless, so requests can overlap; the thread count
+        matches the connection pool size. A single message is posted
+        directly without starting a thread pool.
+        """
+        if not self._is_configured():
+            return [False] * len(messages)
 
-            if settings.smtp_user and settings.smtp_password:
-                smtp.login(settings.smtp_user, settings.smtp_password)
+        sender = self._sender(from_email, from_name)
 
-            smtp.send_message(msg)
-            smtp.quit()
+        if len(messages) <= 1:
+            return [self._post(*message, sender) for message in messages]
 
-            return True
-        except Exception as e:
-            print(f"Error sending email via Curtin: {e}")
-            return False
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            return list(
+                executor.map(
+                    lambda message: self._post(*message, sender),
+                    messages,
+                )
+            )
 
+    def send_personalized(
+        self,
+        subject: str,
+        body: str,
+        recipients: list[tuple[str, dict[str, str]]],
+        from_email: str | None = None,
+        from_name: str | None = None,
+    ) -> list[bool]:
+        """Send one request per batch of recipients using personalizations.
 
-def get_email_provider() -> EmailProvider:
-    """Factory function to get the appropriate email provider.
+        SendGrid applies each recipient's substitutions server-side, so a
+        fan-out of N recipients takes ceil(N / 1000) HTTP requests.
+        """
+        if not self._is_configured():
+            return [False] * len(recipients)
+
+        sender = self._sender(from_email, from_name)
+        results: list[bool] = []
+        for start in range(0, len(recipients), self.max_personalizations):
+            batch = recipients[start:start + self.max_personalizations]
+            personalizations = [
+                {"to": [{"email": to_email}], "substitutions": values}
+                for to_email, values in batch
+            ]
+            sent = self._post_payload(
+                {
+                    "personalizations": personalizations,
+                    "from": sender,
+                    "subject": subject,
+                    "content": [{"type": "text/html", "value": body}],
+                }
+            )
+            results.extend([sent] * len(batch))
+
+        return results
+
+
+class CurtinEmailProvider(SMTPBatchEmailProvider):
+    """Curtin University email provider (SMTP wrapper)."""
+
+    label = "Curtin"
+
+    def _open(self) -> "smtplib.SMTP":
+        """Connect to the Curtin SMTP server."""
+        import smtplib
+
+        return smtplib.SMTP(settings.smtp_server, settings.smtp_port)
+
+    def _login(self, smtp: "smtplib.SMTP", from_email: str) -> None:  # noqa: ARG002
+        """Start TLS and log in with the SMTP credentials."""
+        # Curtin uses TLS on port 587
+        smtp.starttls(context=_ssl_context())
+
+        if settings.smtp_user and settings.smtp_password:
+            smtp.login(settings.smtp_user, settings.smtp_password)
+
+
+EMAIL_PROVIDERS: dict[str, type[EmailProvider]] = {
+    "dev": DevEmailProvider,
+    "gmail": GmailEmailProvider,
+    "sendgrid": SendGridEmailProvider,
+    "custom": SMTPEmailProvider,
+    "curtin": CurtinEmailProvider,
+}
+
+
+@lru_cache
+def _provider_instance(provider: str) -> EmailProvider:
+    """Validate a provider name and create it once; providers hold no per-send state.
+
+    Exceptions are not cached, so an invalid name fails on every call.
+
+    Args:
+        provider: EMAIL_PROVIDER setting, as configured
 
     Returns:
-        EmailProvider instance based on configured EMAIL_PROVIDER
+        Shared EmailProvider instance
 
     Raises:
-        ValueError: If EMAIL_PROVIDER is not supported
+        ValueError: If the provider is not supported
     """
-    provider = settings.email_provider.lower()
-
-    providers = {
-        "dev": DevEmailProvider,
-        "gmail": GmailEmailProvider,
-        "sendgrid": SendGridEmailProvider,
-        "custom": SMTPEmailProvider,
-        "curtin": CurtinEmailProvider,
-    }
+    name = provider.lower()
 
-    if provider not in providers:
+    if name not in EMAIL_PROVIDERS:
         raise ValueError(
-            f"Unsupported email provider: {provider}. "
-            f"Supported: {', '.join(providers.keys())}"
+            f"Unsupported email provider: {name}. "
+            f"Supported: {', '.join(EMAIL_PROVIDERS.keys())}"
         )
 
-    return providers[provider]()
+    return EMAIL_PROVIDERS[name]()
+
+
+def get_email_provider() -> EmailProvider:
+    """Factory function to get the appropriate email provider.
+
+    The name is validated once, when the provider is first created (the app
+    does this at startup); later calls are a cache lookup.
+
+    Returns:
+        EmailProvider instance based on configured EMAIL_PROVIDER
+
+    Raises:
+        ValueError: If EMAIL_PROVIDER is not supported
+    """
+    return _provider_instance(settings.email_provider)
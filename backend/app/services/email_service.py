@@ -1,17 +1,26 @@
 """Email notification service with flexible provider support."""
 
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import settings
-from app.models import Resource, User
-from app.services.email_provider import get_email_provider
+from app.services.email_provider import get_email_provider, substitute
+
+# Models are only needed for annotations; importing them at runtime would pull
+# in SQLModel and the ORM metadata for callers that just send email
+if TYPE_CHECKING:
+    from app.models import Resource, User
 
 logger = logging.getLogger(__name__)
 
-# In-memory store for mocked emails (for testing)
-_email_log: list[dict[str, Any]] = []
+# In-memory store for mocked emails (for testing). Only the dev provider
+# records, and the oldest entries are dropped so it cannot grow without bound.
+_email_log: deque[dict[str, Any]] = deque(maxlen=1000)
+
+# Per-recipient placeholder in bulk email bodies (SendGrid substitution syntax)
+NAME_PLACEHOLDER = "-recipient_name-"
 
 
 class EmailNotification:
@@ -48,30 +57,113 @@ def send_email(notification: EmailNotification) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    return send_emails([notification]) == 1
+
+
+def send_emails(notifications: list[EmailNotification]) -> int:
+    """Send a batch of email notifications in one provider call.
+
+    SMTP providers deliver the whole batch over a single connection.
+
+    Args:
+        notifications: Email notifications to send
+
+    Returns:
+        Number of emails sent successfully
+    """
+    if not notifications:
+        return 0
+
     try:
         # Get the configured email provider
         provider = get_email_provider()
 
         # Send via provider
-        success = provider.send_email(
-            to_email=notification.recipient_email,
-            subject=notification.subject,
-            body=notification.body,
+        results = provider.send_bulk(
+            [(n.recipient_email, n.subject, n.body) for n in notifications],
             from_email=settings.mail_from,
             from_name=settings.mail_from_name,
         )
+    except Exception as e:
+        logger.error(f"Error sending email: {e}")
+        return 0
+
+    _record_results(notifications, results)
+    return sum(results)
+
+
+def send_personalized_emails(
+    subject: str,
+    body: str,
+    recipients: list[tuple[str, dict[str, str]]],
+    notification_type: str,
+) -> int:
+    """Send one templated email to many recipients in one provider call.
+
+    SendGrid receives the template once with per-recipient substitutions;
+    other providers render each email and send them as a batch.
+
+    Args:
+        subject: Email subject
+        body: Email body containing placeholders
+        recipients: (recipient_email, {placeholder: value}) for each recipient
+        notification_type: Type of notification (new_request, new_solution, etc)
+
+    Returns:
+        Number of emails sent successfully
+    """
+    if not recipients:
+        return 0
 
+    try:
+        provider = get_email_provider()
+        results = provider.send_personalized(
+            subject,
+            body,
+            recipients,
+            from_email=settings.mail_from,
+            from_name=settings.mail_from_name,
+        )
+    except Exception as e:
+        logger.error(f"Error sending email: {e}")
+        return 0
+
+    # Rendered bodies are only kept by the dev email log; other providers
+    # just log the recipient, so skip the per-recipient substitution
+    render = settings.email_provider == "dev"
+    notifications = [
+        EmailNotification(
+            recipient_email=recipient_email,
+            subject=subject,
+            body=substitute(body, values) if render else body,
+            notification_type=notification_type,
+        )
+        for recipient_email, values in recipients
+    ]
+    _record_results(notifications, results)
+    return sum(results)
+
+
+def _record_results(notifications: list[EmailNotification], results: list[bool]) -> None:
+    """Log each send outcome and keep successful emails in the memory log.
+
+    Args:
+        notifications: Notifications that were sent
+        results: Whether each notification was sent, in order
+    """
+    for notification, success in zip(notifications, results, strict=True):
         if success:
             # Store in memory log for testing
-            _email_log.append(
-                {
-                    "to": notification.recipient_email,
-                    "subject": notification.subject,
-                    "body": notification.body,
-                    "type": notification.notification_type,
-                    "timestamp": notification.timestamp,
-                }
-            )
+            if settings.email_provider == "dev":
+                _email_log.append(
+                    {
+                        "to": notification.recipient_email,
+                        "subject": notification.subject,
+                        "body": notification.body,
+                        "type": notification.notification_type,
+                        "timestamp": notification.timestamp,
+                    }
+                )
 
             logger.info(
                 f"Email sent ({settings.email_provider}): "
@@ -83,15 +175,10 @@ def send_email(notification: EmailNotification) -> bool:
                 f"{notification.notification_type} to {notification.recipient_email}"
             )
 
-        return success
-    except Exception as e:
-        logger.error(f"Error sending email: {e}")
-        return False
-
 
 def notify_new_request(
-    resource: Resource,
-    subscribers: list[User],
+    resource: "Resource",
+    subscribers: list["User"],
 ) -> int:
     """Notify subscribers when a new request is posted.
 
@@ -105,16 +192,18 @@ def notify_new_request(
     if not subscribers:
         return 0
 
-    emails_sent = 0
     tags_str = ", ".join(resource.system_tags[:3]) if resource.system_tags else "General"
 
-    for subscriber in subscribers:
-        # Skip if subscriber has disabled request notifications
-        if not subscriber.notification_prefs.get("notify_requests", True):
-            continue
+    # Skip subscribers who have disabled request notifications
+    recipients = [
+        (subscriber.email, {NAME_PLACEHOLDER: subscriber.full_name})
+        for subscriber in subscribers
+        if subscriber.notification_prefs.get("notify_requests", True)
+    ]
 
-        subject = f"New AI Request: {resource.title}"
-        body = f"""Hi {subscriber.full_name},
+    subject = f"New AI Request: {resource.title}"
+    # Only the greeting differs per subscriber, so the body is built once
+    body = f"""Hi {NAME_PLACEHOLDER},
 
 A new request has been posted on The AI Exchange that matches your interests:
 
@@ -132,22 +221,14 @@ Best regards,
 The AI Exchange Team
 """
 
-        notification = EmailNotification(
-            recipient_email=subscriber.email,
-            subject=subject,
-            body=body,
-            notification_type="new_request",
-        )
-
-        if send_email(notification):
-            emails_sent += 1
-
-    return emails_sent
+    # One provider call for all recipients (a single SMTP connection, or one
+    # SendGrid request per 1000 recipients)
+    return send_personalized_emails(subject, body, recipients, "new_request")
 
 
 def notify_new_solution(
-    solution: Resource,
-    requester: User,
+    solution: "Resource",
+    requester: "User",
 ) -> bool:
     """Notify requester when a solution is posted to their request.
 
@@ -194,9 +275,9 @@ def get_email_log() -> list[dict[str, Any]]:
     """Get log of all mocked emails sent (for testing).
 
     Returns:
-        List of email records
+        List of email records (most recent 1000)
     """
-    return _email_log
+    return list(_email_log)
 
 
 def clear_email_log() -> None:
@@ -204,11 +285,10 @@ def clear_email_log() -> None:
 
     Used to reset state between tests.
     """
-    global _email_log
-    _email_log = []
+    _email_log.clear()
 
 
-def send_verification_email(user: User, verification_code: str) -> bool:
+def send_verification_email(user: "User", verification_code: str) -> bool:
     """Send email verification code to user.
 
     Args:
@@ -247,7 +327,7 @@ The AI Exchange Team
     return send_email(notification)
 
 
-def send_password_reset_email(user: User, reset_code: str) -> bool:
+def send_password_reset_email(user: "User", reset_code: str) -> bool:
     """Send password reset code to user via email.
 
     Args:
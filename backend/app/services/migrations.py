@@ -0,0 +1,112 @@
+"""Idempotent upgrade steps for databases created from an older schema.
+
+``SQLModel.metadata.create_all`` creates missing tables but never alters
+existing ones, so indexes and data moves added to the models later are
+applied here. Every step is safe to run on each startup.
+"""
+
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Unique indexes that INSERT ... ON CONFLICT relies on: name -> (table, columns)
+UNIQUE_INDEXES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "uq_subscription_user_tag": ("subscription", ("user_id", "tag")),
+    "uq_saved_user_resource": ("usersavedresource", ("user_id", "resource_id")),
+    "uq_tried_user_resource": ("usertriedresource", ("user_id", "resource_id")),
+}
+
+# Former JSON member columns on collection -> (link table, member column, member table)
+COLLECTION_MEMBER_COLUMNS = {
+    "resource_ids": ("collectionresource", "resource_id", "resource"),
+    "prompt_ids": ("collectionprompt", "prompt_id", "prompt"),
+}
+
+
+def ensure_unique_indexes(connection: Connection) -> None:
+    """Create the unique indexes missing from older databases.
+
+    Duplicate rows, which older databases may hold, are deleted first
+    (keeping the oldest row), as the index could not be created otherwise.
+
+    Args:
+        connection: Database connection (inside a transaction)
+    """
+    for name, (table, columns) in UNIQUE_INDEXES.items():
+        column_list = ", ".join(columns)
+        removed = connection.execute(
+            text(
+                f"DELETE FROM {table} WHERE id NOT IN "
+                f"(SELECT MIN(id) FROM {table} GROUP BY {column_list})"
+            )
+        ).rowcount
+        if removed:
+            logger.info(f"Removed {removed} duplicate rows from {table}")
+        connection.execute(
+            text(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({column_list})")
+        )
+
+
+def backfill_collection_members(connection: Connection) -> int:
+    """Move collection members from the old JSON columns into the link tables.
+
+    Collections used to keep their members in ``resource_ids``/``prompt_ids``
+    JSON arrays. Each array is copied, in order, into CollectionResource or
+    CollectionPrompt, skipping IDs that no longer exist, and the old column
+    is then dropped, so running this again is a no-op.
+
+    Args:
+        connection: Database connection (inside a transaction)
+
+    Returns:
+        Number of link rows inserted
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("collection")}
+    postgres = connection.dialect.name == "postgresql"
+    inserted = 0
+
+    for json_column, (link_table, member_column, member_table) in COLLECTION_MEMBER_COLUMNS.items():
+        if json_column not in columns:
+            continue
+
+        if postgres:
+            statement = f"""
+                INSERT INTO {link_table} (collection_id, {member_column}, position)
+                SELECT c.id, m.id, e.ord - 1
+                FROM collection c
+                CROSS JOIN jsonb_array_elements_text(c.{json_column}::jsonb)
+                    WITH ORDINALITY AS e(value, ord)
+                JOIN {member_table} m ON m.id::text = e.value
+                WHERE jsonb_typeof(c.{json_column}::jsonb) = 'array'
+                ON CONFLICT DO NOTHING
+            """
+        else:
+            # UUIDs are stored as 32 hex digits on SQLite, without dashes
+            statement = f"""
+                INSERT OR IGNORE INTO {link_table} (collection_id, {member_column}, position)
+                SELECT c.id, m.id, e.key
+                FROM collection c, json_each(c.{json_column}) AS e
+                JOIN {member_table} m ON m.id = replace(lower(e.value), '-', '')
+                WHERE json_type(c.{json_column}) = 'array'
+            """
+        inserted += connection.execute(text(statement)).rowcount
+        connection.execute(text(f"ALTER TABLE collection DROP COLUMN {json_column}"))
+
+    return inserted
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """Bring a database created from an older schema up to date.
+
+    Run after ``create_all``, so every table exists.
+
+    Args:
+        connection: Database connection (inside a transaction)
+    """
+    ensure_unique_indexes(connection)
+    moved = backfill_collection_members(connection)
+    if moved:
+        logger.info(f"Moved {moved} collection members into link tables")
@@ -1,5 +1,13 @@
-"""Initialize database and create first admin user."""
+"""Initialize database and create first admin user.
 
+Admin details come from --email/--full-name/--password or the ADMIN_EMAIL,
+ADMIN_NAME and ADMIN_PASSWORD environment variables, so the script can run
+unattended (CI, container builds). Anything missing is prompted for only
+when stdin is a terminal.
+"""
+
+import argparse
+import os
 import sys
 from uuid import uuid4
 
@@ -8,23 +16,96 @@ from sqlmodel import Session, SQLModel, select
 from app.core.security import hash_password
 from app.models import ProfessionalRole, User, UserRole
 from app.services.database import engine
-
-
-def init_db() -> None:
-    """Create database tables and first admin user."""
+from app.services.migrations import upgrade_schema
+
+MIN_PASSWORD_LENGTH = 8
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse admin details from the command line, defaulting to env vars.
+
+    Args:
+        argv: Arguments to parse (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--email",
+        default=os.environ.get("ADMIN_EMAIL"),
+        help="Admin email (env: ADMIN_EMAIL)",
+    )
+    parser.add_argument(
+        "--full-name",
+        default=os.environ.get("ADMIN_NAME"),
+        help="Admin full name (env: ADMIN_NAME)",
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get("ADMIN_PASSWORD"),
+        help=f"Admin password, min {MIN_PASSWORD_LENGTH} chars (env: ADMIN_PASSWORD)",
+    )
+    return parser.parse_args(argv)
+
+
+def _require(value: str | None, prompt: str, name: str) -> str:
+    """Return a provided value, prompting for it only on an interactive terminal.
+
+    Args:
+        value: Value from arguments or environment
+        prompt: Prompt to show if the value is missing
+        name: Option name used in the error message
+
+    Returns:
+        Non-empty value
+
+    Raises:
+        SystemExit: If the value is missing and stdin is not a terminal
+    """
+    value = (value or "").strip()
+    if value:
+        return value
+
+    if not sys.stdin.isatty():
+        raise SystemExit(f"✗ Missing {name} (pass it as an argument or environment variable)")
+
+    while not value:
+        value = input(prompt).strip()
+    return value
+
+
+def init_db(
+    email: str | None = None,
+    full_name: str | None = None,
+    password: str | None = None,
+) -> None:
+    """Create database tables and first admin user.
+
+    Args:
+        email: Admin email (prompted for if missing and interactive)
+        full_name: Admin full name (prompted for if missing and interactive)
+        password: Admin password (prompted for if missing and interactive)
+
+    Raises:
+        SystemExit: If required details are missing or invalid
+    """
     print("Initializing database...")
 
     # Create tables
     SQLModel.metadata.create_all(engine)
     print("✓ Database tables created/verified")
 
-    # Check if admin user exists
+    with engine.begin() as connection:
+        upgrade_schema(connection)
+
     with Session(engine) as session:
-        admin = session.exec(
-            select(User).where(User.role == UserRole.ADMIN)
+        # Check if an admin exists (id only, stop at the first match)
+        admin_id = session.exec(
+            select(User.id).where(User.role == UserRole.ADMIN).limit(1)
         ).first()
 
-        if admin:
+        if admin_id:
             print("✓ Admin user already exists")
             return
 
@@ -33,23 +114,19 @@ def init_db() -> None:
         print("Creating first admin user")
         print("=" * 60)
 
-        while True:
-            email = input("Enter admin email: ").strip()
-            if "@curtin.edu.au" not in email:
-                print("⚠ Warning: Email is not @curtin.edu.au domain")
-            if email:
-                break
+        email = _require(email, "Enter admin email: ", "--email / ADMIN_EMAIL")
+        if "@curtin.edu.au" not in email:
+            print("⚠ Warning: Email is not @curtin.edu.au domain")
 
-        while True:
-            full_name = input("Enter admin full name: ").strip()
-            if full_name:
-                break
+        full_name = _require(full_name, "Enter admin full name: ", "--full-name / ADMIN_NAME")
 
-        while True:
-            password = input("Enter admin password (min 8 chars): ").strip()
-            if len(password) >= 8:
-                break
-            print("⚠ Password must be at least 8 characters")
+        password_prompt = f"Enter admin password (min {MIN_PASSWORD_LENGTH} chars): "
+        password = _require(password, password_prompt, "--password / ADMIN_PASSWORD")
+        while len(password) < MIN_PASSWORD_LENGTH:
+            if not sys.stdin.isatty():
+                raise SystemExit(f"✗ Password must be at least {MIN_PASSWORD_LENGTH} characters")
+            print(f"⚠ Password must be at least {MIN_PASSWORD_LENGTH} characters")
+            password = _require(None, password_prompt, "--password / ADMIN_PASSWORD")
 
         # Create admin user
         admin_user = User(
@@ -58,7 +135,7 @@ def init_db() -> None:
             full_name=full_name,
             hashed_password=hash_password(password),
             role=UserRole.ADMIN,
-            professional_role=ProfessionalRole.EDUCATOR,
+            professional_roles=[ProfessionalRole.EDUCATOR],
             is_active=True,
             is_approved=True,
         )
@@ -74,8 +151,9 @@ def init_db() -> None:
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        init_db()
+        init_db(email=args.email, full_name=args.full_name, password=args.password)
         print("\n✓ Database initialization complete!")
     except KeyboardInterrupt:
         print("\n\n⚠ Database initialization cancelled")
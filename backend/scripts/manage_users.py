@@ -9,26 +9,29 @@ Usage:
     python manage_users.py create-admin <email> <name> <password>  # Create new admin
 """
 
+import argparse
 import sys
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlmodel import Session, select
+from sqlmodel import func, select
 
 from app.core.security import hash_password
 from app.models import User, UserRole
-from app.services.database import engine
 
 
 def list_users():
     """List all users with their roles."""
-    session = Session(engine)
-    try:
-        users = session.exec(select(User)).all()
+    from app.services.database import session_scope
 
-        if not users:
+    with session_scope() as session:
+        # Role counts come from SQL, so the user rows never need to be held
+        role_counts = dict(session.exec(select(User.role, func.count()).group_by(User.role)).all())
+        total = sum(role_counts.values())
+
+        if not total:
             print("❌ No users found in database")
             return
 
@@ -37,22 +40,27 @@ def list_users():
         print(f"{'Email':<35} {'Name':<25} {'Role':<10}")
         print("-" * 70)
 
-        for user in sorted(users, key=lambda u: u.email):
-            print(f"{user.email:<35} {user.full_name:<25} {user.role.value:<10}")
+        # Sorted by the database and fetched in chunks as they are printed
+        users = session.exec(
+            select(User.email, User.full_name, User.role)
+            .order_by(User.email)
+            .execution_options(yield_per=200)
+        )
+        for email, full_name, role in users:
+            print(f"{email:<35} {full_name:<25} {role.value:<10}")
 
         print("-" * 70)
-        admin_count = len([u for u in users if u.role == UserRole.ADMIN])
-        staff_count = len([u for u in users if u.role == UserRole.STAFF])
-        print(f"\nTotal: {len(users)} users ({admin_count} ADMIN, {staff_count} STAFF)")
-
-    finally:
-        session.close()
+        print(
+            f"\nTotal: {total} users "
+            f"({role_counts.get(UserRole.ADMIN, 0)} ADMIN, {role_counts.get(UserRole.STAFF, 0)} STAFF)"
+        )
 
 
 def promote_to_admin(email: str):
     """Promote a user to ADMIN role."""
-    session = Session(engine)
-    try:
+    from app.services.database import session_scope
+
+    with session_scope() as session:
         user = session.exec(select(User).where(User.email == email)).first()
 
         if not user:
@@ -70,18 +78,12 @@ def promote_to_admin(email: str):
         print(f"✅ Promoted {email} ({user.full_name}) to ADMIN")
         return True
 
-    except Exception as e:
-        session.rollback()
-        print(f"❌ Error: {e}")
-        return False
-    finally:
-        session.close()
-
 
 def create_admin(email: str, full_name: str, password: str):
     """Create a new ADMIN user."""
-    session = Session(engine)
-    try:
+    from app.services.database import session_scope
+
+    with session_scope() as session:
         # Check if user exists
         existing = session.exec(select(User).where(User.email == email)).first()
         if existing:
@@ -106,43 +108,31 @@ def create_admin(email: str, full_name: str, password: str):
         print(f"   Password: {password}")
         return True
 
-    except Exception as e:
-        session.rollback()
-        print(f"❌ Error: {e}")
-        return False
-    finally:
-        session.close()
-
 
 def main():
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
-
-    command = sys.argv[1].lower()
-
-    if command == "list-users":
+    # The database engine is only created once a valid command is dispatched,
+    # so --help and usage errors return without touching the database
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list-users", help="Show all users and roles")
+    promote = commands.add_parser("promote-admin", help="Promote user to ADMIN")
+    promote.add_argument("email")
+    create = commands.add_parser("create-admin", help="Create new admin")
+    create.add_argument("email")
+    create.add_argument("name")
+    create.add_argument("password")
+    args = parser.parse_args()
+
+    if args.command == "list-users":
         list_users()
-    elif command == "promote-admin":
-        if len(sys.argv) < 3:
-            print("❌ Usage: python manage_users.py promote-admin <email>")
-            sys.exit(1)
-        email = sys.argv[2]
-        success = promote_to_admin(email)
-        sys.exit(0 if success else 1)
-    elif command == "create-admin":
-        if len(sys.argv) < 5:
-            print("❌ Usage: python manage_users.py create-admin <email> <name> <password>")
-            sys.exit(1)
-        email = sys.argv[2]
-        name = sys.argv[3]
-        password = sys.argv[4]
-        success = create_admin(email, name, password)
+    elif args.command == "promote-admin":
+        success = promote_to_admin(args.email)
         sys.exit(0 if success else 1)
     else:
-        print(f"❌ Unknown command: {command}")
-        print(__doc__)
-        sys.exit(1)
+        success = create_admin(args.email, args.name, args.password)
+        sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
@@ -1,53 +1,336 @@
 """Pytest configuration and shared fixtures."""
 
-from collections.abc import Generator
+import os
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any
 
+# Test settings; must be set before app settings are loaded. Cheap argon2
+# parameters, no rate limiting, and no table creation or seeding at startup
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "1")
+os.environ.setdefault("PASSWORD_HASH_MEMORY_KIB", "1024")
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("INIT_DB_ON_STARTUP", "false")
+
+import httpx
+import orjson
 import pytest
-from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from fastapi.testclient import TestClient
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
 
+from app.api.subscriptions import _subscriptions_cache
 from app.core.rate_limiter import disable_rate_limiter
+from app.core.security import create_access_token, hash_password, pwd_context
 from app.main import app
-from app.services.database import get_session
+from app.models import Subscription, User, UserRole
+from app.services.database import JSON_ENGINE_KWARGS, get_session
+
+# Password for users created directly by tests
+TEST_PASSWORD = "pass123"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _reuse_password_hashes() -> Generator[None, None, None]:
+    """Hash and verify each distinct test password once per run.
+
+    Tests already use the cheapest argon2 parameters (set above); reusing
+    the hash, salt included, for a repeated plaintext skips even that, and
+    a (password, hash) pair always verifies the same way, so its result is
+    cached too. Test-only: real accounts must never share salts.
+
+    Yields:
+        None
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(pwd_context, "hash", lru_cache(maxsize=None)(pwd_context.hash))
+        mp.setattr(pwd_context, "verify", lru_cache(maxsize=None)(pwd_context.verify))
+        yield
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _parse_responses_with_orjson() -> Generator[None, None, None]:
+    """Decode test client response bodies with orjson instead of stdlib json.
+
+    Yields:
+        None
+    """
+
+    def _json(response: httpx.Response, **_kwargs: Any) -> Any:
+        return orjson.loads(response.content)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", _json)
+        yield
+
+
+@pytest.fixture(scope="session")
+def hashed_password() -> str:
+    """Hash TEST_PASSWORD once for every test that inserts users directly.
+
+    Returns:
+        Password hash
+    """
+    return hash_password(TEST_PASSWORD)
+
+
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture() -> Generator[Engine, None, None]:
+    """Create the test database and its schema once per test process.
+
+    Defaults to an in-memory SQLite database held on a single shared
+    connection (``StaticPool``), which is private to the process, so each
+    pytest-xdist worker gets its own database. Set TEST_DATABASE_URL to a
+    Postgres URL to run against Postgres instead; each worker then uses its
+    own schema, dropped at the end of the run.
+
+    Yields:
+        Database engine
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    schema = f"test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+    if url:
+        engine = create_engine(
+            url,
+            connect_args={"options": f"-csearch_path={schema}"},
+            **JSON_ENGINE_KWARGS,
+        )
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+    else:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            **JSON_ENGINE_KWARGS,
+        )
+
+        # pysqlite only emits BEGIN lazily, which breaks SAVEPOINT; let
+        # SQLAlchemy control transactions instead (see the SQLAlchemy SQLite docs)
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_transactions(dbapi_connection, _connection_record):  # type: ignore[no-untyped-def]
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _emit_begin(connection):  # type: ignore[no-untyped-def]
+            connection.exec_driver_sql("BEGIN")
+
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    if url:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f'DROP SCHEMA "{schema}" CASCADE')
+    engine.dispose()
+
+
+@pytest.fixture(name="connection", scope="module")
+def connection_fixture(engine: Engine) -> Generator[Connection, None, None]:
+    """Open one connection per test module inside a transaction rolled back at the end.
+
+    Data created by module-scoped fixtures (such as ``admin_headers``) lives in
+    this transaction, so it is shared by the module's tests and gone before
+    the next module starts.
+
+    Args:
+        engine: Shared test database engine
+
+    Yields:
+        Database connection
+    """
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+
+
+@pytest.fixture(name="module_session", scope="module")
+def module_session_fixture(connection: Connection) -> Generator[Session, None, None]:
+    """Yield a session for module-scoped fixtures; its commits last for the module.
+
+    Args:
+        connection: Module database connection
+
+    Yields:
+        Database session
+    """
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+        yield session
 
 
 @pytest.fixture(name="session")
-def session_fixture() -> Generator[Session, None, None]:
-    """Create an in-memory SQLite database for testing.
+def session_fixture(connection: Connection) -> Generator[Session, None, None]:
+    """Yield a session whose changes are rolled back after the test.
+
+    The test runs inside a savepoint on the module connection; commits made
+    by the code under test only release nested savepoints, so the schema is
+    created once per run and each test sees only the module's shared data.
+
+    Args:
+        connection: Module database connection
 
     Yields:
         Database session
     """
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
+    savepoint = connection.begin_nested()
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
         yield session
+    if savepoint.is_active:
+        savepoint.rollback()
+
+
+@contextmanager
+def use_session(session: Session) -> Iterator[None]:
+    """Serve requests from the given session while the block runs.
+
+    Args:
+        session: Database session to inject in place of get_session
+    """
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+
+
+def create_user(
+    session: Session,
+    hashed_password: str,
+    email: str = "user@curtin.edu.au",
+    full_name: str = "Test User",
+    **fields: Any,
+) -> User:
+    """Insert a user directly, active, verified and approved unless overridden.
+
+    Args:
+        session: Database session
+        hashed_password: Password hash (the ``hashed_password`` fixture for TEST_PASSWORD)
+        email: User email
+        full_name: User full name
+        **fields: Other User fields to set or override (role, is_approved, ...)
+
+    Returns:
+        Created user
+    """
+    user = User(
+        email=email,
+        full_name=full_name,
+        hashed_password=hashed_password,
+        **{"is_active": True, "is_verified": True, "is_approved": True, **fields},
+    )
+    session.add(user)
+    session.commit()
+    return user
+
+
+def auth_headers_for(user: User) -> dict[str, str]:
+    """Mint an access token for a user without going through login.
+
+    Args:
+        user: User to authenticate as
+
+    Returns:
+        Authorization headers for the user
+    """
+    token = create_access_token(data={"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def add_subscriptions(session: Session, email: str, tags: list[str]) -> None:
+    """Subscribe a user to tags directly in the database with one commit.
+
+    Args:
+        session: Database session the app is using
+        email: Subscribing user's email
+        tags: Tags to subscribe to
+    """
+    user_id = session.exec(select(User.id).where(User.email == email)).one()
+    session.add_all([Subscription(user_id=user_id, tag=tag) for tag in tags])
+    session.commit()
+    # Writes through the API invalidate this; direct inserts must too
+    _subscriptions_cache.pop(user_id)
+
+
+@pytest.fixture(name="test_client", scope="session")
+def test_client_fixture() -> TestClient:
+    """Create the FastAPI test client once for the whole run.
+
+    The lifespan is not entered, so the app never touches the real database.
+    Tests must not change global app state beyond the per-test session
+    override installed by the client fixture.
+
+    Returns:
+        FastAPI test client
+    """
+    # Disable rate limiting for tests
+    disable_rate_limiter()
+    return TestClient(app)
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session) -> Generator:  # type: ignore[type-arg]
-    """Create a test client with test database.
+def client_fixture(session: Session, test_client: TestClient) -> Generator[TestClient, None, None]:
+    """Point the shared test client at this test's database session.
 
     Args:
         session: Test database session
+        test_client: Shared FastAPI test client
 
     Yields:
         FastAPI test client
     """
-    # Disable rate limiting for tests
-    disable_rate_limiter()
 
-    def get_session_override() -> Session:
-        return session
+    with use_session(session):
+        yield test_client
+    test_client.cookies.clear()
+
+
+@pytest.fixture(scope="module")
+def admin_headers(module_session: Session, hashed_password: str) -> dict[str, str]:
+    """Create an admin user once per module.
+
+    Args:
+        module_session: Module database session
+        hashed_password: Hash of TEST_PASSWORD
+
+    Returns:
+        Authorization headers for admin
+    """
+    admin = create_user(
+        module_session, hashed_password, "admin@curtin.edu.au", "Admin User", role=UserRole.ADMIN
+    )
+    return auth_headers_for(admin)
 
-    app.dependency_overrides[get_session] = get_session_override
 
-    from fastapi.testclient import TestClient
+@pytest.fixture(scope="module")
+def staff_headers(module_session: Session, hashed_password: str) -> dict[str, str]:
+    """Create a staff user once per module.
 
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+    Args:
+        module_session: Module database session
+        hashed_password: Hash of TEST_PASSWORD
+
+    Returns:
+        Authorization headers for staff
+    """
+    staff = create_user(module_session, hashed_password, "staff@curtin.edu.au", "Staff User")
+    return auth_headers_for(staff)
+
+
+@pytest.fixture
+def target_user(session: Session, hashed_password: str) -> User:
+    """Create a staff user for admin user-management tests.
+
+    The user is active but not yet approved, so every admin action on it
+    changes something.
+
+    Args:
+        session: Test database session
+        hashed_password: Hash of TEST_PASSWORD
+
+    Returns:
+        Created user
+    """
+    return create_user(
+        session, hashed_password, "target@curtin.edu.au", "Target User", is_approved=False
+    )
@@ -2,58 +2,11 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
-
-from app.core.security import hash_password
-from app.models import User, UserRole
-
-
-@pytest.fixture
-def admin_headers(client: TestClient, session: Session) -> dict[str, str]:  # noqa: ARG001
-    """Create admin user and return auth headers.
-
-    Args:
-        client: Test client
-        session: Database session
-
-    Returns:
-        Authorization headers for admin
-    """
-    # Register first user (becomes admin)
-    response = client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "admin@curtin.edu.au",
-            "full_name": "Admin User",
-            "password": "adminpass123",
-        },
-    )
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
-
-
-@pytest.fixture
-def staff_headers(client: TestClient, admin_headers: dict[str, str]) -> dict[str, str]:  # noqa: ARG001
-    """Create staff user and return auth headers.
-
-    Args:
-        client: Test client
-        admin_headers: Admin headers (ensures admin is created first)
-
-    Returns:
-        Authorization headers for staff
-    """
-    response = client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "staff@curtin.edu.au",
-            "full_name": "Staff User",
-            "password": "staffpass123",
-        },
-    )
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+from sqlmodel import Session, select
 
+from app.api.subscriptions import MAX_BATCH_TAGS
+from app.models import Resource, ResourceType, Subscription, User
+from tests.conftest import add_subscriptions
 
 # Admin User Management Tests
 
@@ -96,177 +49,111 @@ def test_list_users_staff_forbidden(
 def test_get_user_admin(
     client: TestClient,
     admin_headers: dict[str, str],
-    session: Session,
+    target_user: User,
 ) -> None:
     """Test getting a specific user as admin.
 
     Args:
         client: Test client
         admin_headers: Admin authorization headers
-        session: Database session
+        target_user: User to retrieve
     """
-    # Create a user to retrieve
-    user = User(
-        email="testuser@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("pass123"),
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
     response = client.get(
-        f"/api/v1/admin/users/{user.id}",
+        f"/api/v1/admin/users/{target_user.id}",
         headers=admin_headers,
     )
     assert response.status_code == 200
     data = response.json()
-    assert data["email"] == "testuser@curtin.edu.au"
-
-
-def test_update_user_role(
+    assert data["email"] == "target@curtin.edu.au"
+
+
+@pytest.mark.parametrize(
+    ("action", "body", "field", "expected"),
+    [
+        ("role", {"role": "ADMIN"}, "role", "ADMIN"),
+        ("status", {"is_active": False}, "is_active", False),
+        ("approve", None, "is_approved", True),
+    ],
+)
+def test_update_user_admin(
     client: TestClient,
     admin_headers: dict[str, str],
-    session: Session,
+    target_user: User,
+    action: str,
+    body: dict[str, object] | None,
+    field: str,
+    expected: object,
 ) -> None:
-    """Test changing user role as admin.
+    """Test changing a user's role, active status and approval as admin.
 
     Args:
         client: Test client
         admin_headers: Admin authorization headers
-        session: Database session
+        target_user: Staff user who is active but not yet approved
+        action: Admin user endpoint suffix
+        body: JSON request body, if any
+        field: Response field changed by the action
+        expected: Expected value of the field
     """
-    # Create staff user
-    user = User(
-        email="staffuser@curtin.edu.au",
-        full_name="Staff User",
-        hashed_password=hash_password("pass123"),
-        role=UserRole.STAFF,
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    # Update to admin
     response = client.patch(
-        f"/api/v1/admin/users/{user.id}/role",
-        json={"role": "ADMIN"},
+        f"/api/v1/admin/users/{target_user.id}/{action}",
+        json=body,
         headers=admin_headers,
     )
     assert response.status_code == 200
-    data = response.json()
-    assert data["role"] == "ADMIN"
+    assert response.json()[field] == expected
 
 
-def test_update_user_status(
+def test_deactivated_user_cannot_login(
     client: TestClient,
     admin_headers: dict[str, str],
-    session: Session,
+    target_user: User,
 ) -> None:
-    """Test deactivating user as admin.
+    """Test that a user deactivated by an admin cannot log in.
 
     Args:
         client: Test client
         admin_headers: Admin authorization headers
-        session: Database session
+        target_user: User to deactivate
     """
-    # Create user
-    user = User(
-        email="usertoblock@curtin.edu.au",
-        full_name="User To Block",
-        hashed_password=hash_password("pass123"),
-        is_active=True,
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    # Deactivate
     response = client.patch(
-        f"/api/v1/admin/users/{user.id}/status",
+        f"/api/v1/admin/users/{target_user.id}/status",
         json={"is_active": False},
         headers=admin_headers,
     )
     assert response.status_code == 200
-    data = response.json()
-    assert data["is_active"] is False
 
-    # Verify user cannot login
     login_response = client.post(
         "/api/v1/auth/login",
         json={
-            "email": "usertoblock@curtin.edu.au",
+            "email": "target@curtin.edu.au",
             "password": "pass123",
         },
     )
     assert login_response.status_code == 403
 
 
-def test_approve_user(
-    client: TestClient,
-    admin_headers: dict[str, str],
-    session: Session,
-) -> None:
-    """Test approving external user as admin.
-
-    Args:
-        client: Test client
-        admin_headers: Admin authorization headers
-        session: Database session
-    """
-    # Create unapproved user
-    user = User(
-        email="external@example.com",
-        full_name="External User",
-        hashed_password=hash_password("pass123"),
-        is_approved=False,
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    # Approve
-    response = client.patch(
-        f"/api/v1/admin/users/{user.id}/approve",
-        headers=admin_headers,
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["is_approved"] is True
-
-
 def test_delete_user(
     client: TestClient,
     admin_headers: dict[str, str],
-    session: Session,
+    target_user: User,
 ) -> None:
     """Test deleting user as admin.
 
     Args:
         client: Test client
         admin_headers: Admin authorization headers
-        session: Database session
+        target_user: User to delete
     """
-    # Create user
-    user = User(
-        email="todelete@curtin.edu.au",
-        full_name="To Delete",
-        hashed_password=hash_password("pass123"),
-    )
-    session.add(user)
-    session.commit()
-    user_id = user.id
-
-    # Delete
     response = client.delete(
-        f"/api/v1/admin/users/{user_id}",
+        f"/api/v1/admin/users/{target_user.id}",
         headers=admin_headers,
     )
     assert response.status_code == 204
 
     # Verify deleted
     get_response = client.get(
-        f"/api/v1/admin/users/{user_id}",
+        f"/api/v1/admin/users/{target_user.id}",
         headers=admin_headers,
     )
     assert get_response.status_code == 404
@@ -275,122 +162,83 @@ def test_delete_user(
 # Admin Resource Management Tests
 
 
-def test_verify_resource(
-    client: TestClient,
-    admin_headers: dict[str, str],
-    staff_headers: dict[str, str],
-) -> None:
-    """Test verifying resource as admin.
-
-    Args:
-        client: Test client
-        admin_headers: Admin authorization headers
-        staff_headers: Staff authorization headers
-    """
-    # Create resource as staff
-    resource_response = client.post(
-        "/api/v1/resources",
-        json={
-            "type": "POLICY",
-            "title": "AI Policy",
-            "content_text": "This is our AI policy...",
-            "is_anonymous": False,
-        },
-        headers=staff_headers,
-    )
-    resource_id = resource_response.json()["id"]
+@pytest.fixture
+def resource(
+    request: pytest.FixtureRequest,
+    session: Session,
+    staff_headers: dict[str, str],  # noqa: ARG001
+) -> Resource:
+    """Create a resource owned by the staff user.
 
-    # Verify as admin
-    response = client.patch(
-        f"/api/v1/admin/resources/{resource_id}/verify",
-        headers=admin_headers,
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["is_verified"] is True
+    Parametrize indirectly with a dict of Resource fields to override.
 
+    Args:
+        request: Pytest request (optional field overrides in ``param``)
+        session: Test database session
+        staff_headers: Staff headers (ensures the staff user exists)
 
-def test_hide_resource(
+    Returns:
+        Created resource
+    """
+    staff_id = session.exec(select(User.id).where(User.email == "staff@curtin.edu.au")).one()
+    resource = Resource(
+        user_id=staff_id,
+        type=ResourceType.PROMPT,
+        title="Admin-managed resource",
+        content_text="Content...",
+        **getattr(request, "param", {}),
+    )
+    session.add(resource)
+    session.commit()
+    return resource
+
+
+@pytest.mark.parametrize(
+    ("resource", "action", "field", "expected"),
+    [
+        pytest.param({}, "verify", "is_verified", True, id="verify"),
+        pytest.param({}, "hide", "is_hidden", True, id="hide"),
+        pytest.param({"is_hidden": True}, "unhide", "is_hidden", False, id="unhide"),
+    ],
+    indirect=["resource"],
+)
+def test_moderate_resource(
     client: TestClient,
     admin_headers: dict[str, str],
     staff_headers: dict[str, str],
+    resource: Resource,
+    action: str,
+    field: str,
+    expected: bool,
 ) -> None:
-    """Test hiding resource as admin.
+    """Test verifying, hiding and unhiding a resource as admin.
 
     Args:
         client: Test client
         admin_headers: Admin authorization headers
         staff_headers: Staff authorization headers
+        resource: Resource to moderate
+        action: Admin action endpoint
+        field: Resource field the action sets
+        expected: Expected value of the field afterwards
     """
-    # Create resource
-    resource_response = client.post(
-        "/api/v1/resources",
-        json={
-            "type": "PROMPT",
-            "title": "Inappropriate content",
-            "content_text": "Some bad content...",
-            "is_anonymous": False,
-        },
-        headers=staff_headers,
-    )
-    resource_id = resource_response.json()["id"]
+    resource_id = str(resource.id)
 
-    # Hide as admin
     response = client.patch(
-        f"/api/v1/admin/resources/{resource_id}/hide",
+        f"/api/v1/admin/resources/{resource_id}/{action}",
         headers=admin_headers,
     )
     assert response.status_code == 200
     data = response.json()
-    assert data["is_hidden"] is True
+    assert data[field] is expected
 
-    # Verify hidden from list
+    # Hidden resources drop out of the list, everything else stays in it
     list_response = client.get(
         "/api/v1/resources",
         headers=staff_headers,
     )
-    resources = list_response.json()
-    assert not any(r["id"] == resource_id for r in resources)
-
-
-def test_unhide_resource(
-    client: TestClient,
-    admin_headers: dict[str, str],
-    staff_headers: dict[str, str],
-) -> None:
-    """Test unhiding resource as admin.
-
-    Args:
-        client: Test client
-        admin_headers: Admin authorization headers
-        staff_headers: Staff authorization headers
-    """
-    # Create and hide resource
-    resource_response = client.post(
-        "/api/v1/resources",
-        json={
-            "type": "PROMPT",
-            "title": "Hidden resource",
-            "content_text": "Content...",
-            "is_anonymous": False,
-        },
-        headers=staff_headers,
-    )
-    resource_id = resource_response.json()["id"]
-
-    client.patch(
-        f"/api/v1/admin/resources/{resource_id}/hide",
-        headers=admin_headers,
-    )
-
-    # Unhide
-    response = client.patch(
-        f"/api/v1/admin/resources/{resource_id}/unhide",
-        headers=admin_headers,
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["is_hidden"] is False
+    listed = any(r["id"] == resource_id for r in list_response.json())
+    assert listed is not data["is_hidden"]
 
 
 # Subscription Tests
@@ -443,6 +291,58 @@ def test_subscribe_duplicate(
     assert "already subscribed" in response.json()["detail"].lower()
 
 
+def test_subscribe_batch(
+    client: TestClient,
+    staff_headers: dict[str, str],
+) -> None:
+    """Test subscribing to several tags at once, skipping existing ones.
+
+    Args:
+        client: Test client
+        staff_headers: Staff authorization headers
+    """
+    client.post(
+        "/api/v1/subscriptions/subscribe",
+        json={"tag": "Marketing"},
+        headers=staff_headers,
+    )
+
+    response = client.post(
+        "/api/v1/subscriptions/subscribe-batch",
+        json={"tags": ["Marketing", "Finance", " Finance ", "  "]},
+        headers=staff_headers,
+    )
+    assert response.status_code == 200
+    assert [sub["tag"] for sub in response.json()] == ["Marketing", "Finance"]
+
+    get_response = client.get(
+        "/api/v1/subscriptions",
+        headers=staff_headers,
+    )
+    assert sorted(sub["tag"] for sub in get_response.json()) == ["Finance", "Marketing"]
+
+
+def test_subscribe_batch_rejects_too_many_tags(
+    client: TestClient,
+    session: Session,
+    staff_headers: dict[str, str],
+) -> None:
+    """Test that a batch over MAX_BATCH_TAGS is rejected before any INSERT.
+
+    Args:
+        client: Test client
+        session: Database session
+        staff_headers: Staff authorization headers
+    """
+    response = client.post(
+        "/api/v1/subscriptions/subscribe-batch",
+        json={"tags": [f"tag-{number}" for number in range(MAX_BATCH_TAGS + 1)]},
+        headers=staff_headers,
+    )
+    assert response.status_code == 422
+    assert session.exec(select(Subscription)).all() == []
+
+
 def test_unsubscribe_from_tag(
     client: TestClient,
     staff_headers: dict[str, str],
@@ -478,22 +378,19 @@ def test_unsubscribe_from_tag(
 
 def test_get_subscriptions(
     client: TestClient,
+    session: Session,
     staff_headers: dict[str, str],
 ) -> None:
     """Test getting user subscriptions.
 
     Args:
         client: Test client
+        session: Test database session
         staff_headers: Staff authorization headers
     """
     # Subscribe to multiple tags
     tags = ["Marketing", "Finance", "Analytics"]
-    for tag in tags:
-        client.post(
-            "/api/v1/subscriptions/subscribe",
-            json={"tag": tag},
-            headers=staff_headers,
-        )
+    add_subscriptions(session, "staff@curtin.edu.au", tags)
 
     # Get subscriptions
     response = client.get(
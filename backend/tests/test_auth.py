@@ -1,11 +1,17 @@
 """Tests for authentication endpoints."""
 
 
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
-from app.core.security import hash_password
-from app.models import User, UserRole
+from app.core.security import create_access_token, decode_token
+from app.models import UserRole
+from tests.conftest import TEST_PASSWORD, auth_headers_for, create_user
 
 
 def test_register_new_user(client: TestClient) -> None:
@@ -34,22 +40,18 @@ def test_register_new_user(client: TestClient) -> None:
     assert data["token_type"] == "bearer"
 
 
-def test_register_second_user_is_staff(client: TestClient, session: Session) -> None:
+def test_register_second_user_is_staff(
+    client: TestClient, session: Session, hashed_password: str
+) -> None:
     """Test that second user is STAFF role.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
     # Create first admin
-    admin = User(
-        email="admin@curtin.edu.au",
-        full_name="Admin User",
-        hashed_password=hash_password("admin123"),
-        role=UserRole.ADMIN,
-    )
-    session.add(admin)
-    session.commit()
+    create_user(session, hashed_password, "admin@curtin.edu.au", "Admin User", role=UserRole.ADMIN)
 
     # Register second user
     response = client.post(
@@ -65,21 +67,18 @@ def test_register_second_user_is_staff(client: TestClient, session: Session) ->
     assert data["role"] == "STAFF"  # Second user is staff
 
 
-def test_register_duplicate_email(client: TestClient, session: Session) -> None:
+def test_register_duplicate_email(
+    client: TestClient, session: Session, hashed_password: str
+) -> None:
     """Test registering with duplicate email.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
     # Create existing user
-    user = User(
-        email="existing@curtin.edu.au",
-        full_name="Existing User",
-        hashed_password=hash_password("pass123"),
-    )
-    session.add(user)
-    session.commit()
+    create_user(session, hashed_password, "existing@curtin.edu.au", "Existing User")
 
     # Try to register with same email
     response = client.post(
@@ -112,30 +111,22 @@ def test_register_invalid_domain(client: TestClient) -> None:
     assert "domain" in response.json()["detail"].lower()
 
 
-def test_login_success(client: TestClient, session: Session) -> None:
+def test_login_success(client: TestClient, session: Session, hashed_password: str) -> None:
     """Test successful login.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
-    # Create user
-    user = User(
-        email="user@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("testpass123"),
-        is_active=True,
-        is_approved=True,
-    )
-    session.add(user)
-    session.commit()
+    create_user(session, hashed_password)
 
     # Login
     response = client.post(
         "/api/v1/auth/login",
         json={
             "email": "user@curtin.edu.au",
-            "password": "testpass123",
+            "password": TEST_PASSWORD,
         },
     )
     assert response.status_code == 200
@@ -145,145 +136,70 @@ def test_login_success(client: TestClient, session: Session) -> None:
     assert "refresh_token" in data
 
 
-def test_login_invalid_password(client: TestClient, session: Session) -> None:
-    """Test login with wrong password.
+@pytest.mark.parametrize(
+    ("user_fields", "password", "status_code", "detail"),
+    [
+        pytest.param({}, "wrongpass", 401, "Invalid email or password", id="invalid_password"),
+        pytest.param(None, TEST_PASSWORD, 401, "Invalid email or password", id="user_not_found"),
+        pytest.param({"is_active": False}, TEST_PASSWORD, 403, "deactivated", id="inactive_user"),
+        pytest.param(
+            {"email": "external@example.com", "is_approved": False},
+            TEST_PASSWORD,
+            403,
+            "pending approval",
+            id="unapproved_user",
+        ),
+    ],
+)
+def test_login_rejected(
+    client: TestClient,
+    session: Session,
+    hashed_password: str,
+    user_fields: dict[str, Any] | None,
+    password: str,
+    status_code: int,
+    detail: str,
+) -> None:
+    """Test login failures.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
+        user_fields: Overrides for the user to create, or None for no user
+        password: Password to log in with
+        status_code: Expected response status
+        detail: Expected substring of the error detail
     """
-    # Create user
-    user = User(
-        email="user@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("correctpass"),
-        is_active=True,
-        is_approved=True,
-    )
-    session.add(user)
-    session.commit()
+    email = "user@curtin.edu.au"
+    if user_fields is not None:
+        email = create_user(session, hashed_password, **user_fields).email
 
-    # Try login with wrong password
     response = client.post(
         "/api/v1/auth/login",
         json={
-            "email": "user@curtin.edu.au",
-            "password": "wrongpass",
+            "email": email,
+            "password": password,
         },
     )
-    assert response.status_code == 401
-    assert "Invalid email or password" in response.json()["detail"]
-
-
-def test_login_user_not_found(client: TestClient) -> None:
-    """Test login with nonexistent user.
-
-    Args:
-        client: Test client
-    """
-    response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "nonexistent@curtin.edu.au",
-            "password": "password123",
-        },
-    )
-    assert response.status_code == 401
-    assert "Invalid email or password" in response.json()["detail"]
-
+    assert response.status_code == status_code
+    assert detail in response.json()["detail"]
 
-def test_login_inactive_user(client: TestClient, session: Session) -> None:
-    """Test login with deactivated user.
 
-    Args:
-        client: Test client
-        session: Database session
-    """
-    # Create inactive user
-    user = User(
-        email="inactive@curtin.edu.au",
-        full_name="Inactive User",
-        hashed_password=hash_password("pass123"),
-        is_active=False,
-    )
-    session.add(user)
-    session.commit()
-
-    # Try login
-    response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "inactive@curtin.edu.au",
-            "password": "pass123",
-        },
-    )
-    assert response.status_code == 403
-    assert "deactivated" in response.json()["detail"]
-
-
-def test_login_unapproved_user(client: TestClient, session: Session) -> None:
-    """Test login with unapproved user.
-
-    Args:
-        client: Test client
-        session: Database session
-    """
-    # Create unapproved user (external domain)
-    user = User(
-        email="external@example.com",
-        full_name="External User",
-        hashed_password=hash_password("pass123"),
-        is_active=True,
-        is_approved=False,
-    )
-    session.add(user)
-    session.commit()
-
-    # Try login
-    response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "external@example.com",
-            "password": "pass123",
-        },
-    )
-    assert response.status_code == 403
-    assert "pending approval" in response.json()["detail"]
-
-
-def test_get_current_user(client: TestClient, session: Session) -> None:
+def test_get_current_user(client: TestClient, session: Session, hashed_password: str) -> None:
     """Test getting current user info.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
-    # Create and login user
-    user = User(
-        email="user@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("pass123"),
-        is_active=True,
-        is_approved=True,
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    # Login to get token
-    login_response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "user@curtin.edu.au",
-            "password": "pass123",
-        },
-    )
-    token = login_response.json()["access_token"]
+    user = create_user(session, hashed_password)
 
     # Get current user
     response = client.get(
         "/api/v1/auth/me",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers_for(user),
     )
     assert response.status_code == 200
     data = response.json()
@@ -316,6 +232,17 @@ def test_get_current_user_invalid_token(client: TestClient) -> None:
     assert "Invalid or expired token" in response.json()["detail"]
 
 
+def test_decode_token_rechecks_expiry_on_cache_hit() -> None:
+    """Test that a cached token is rejected once it has expired."""
+    token = create_access_token({"sub": "user"}, expires_delta=timedelta(seconds=60))
+    payload = decode_token(token)
+    assert payload is not None
+    assert payload["sub"] == "user"
+
+    with patch("app.core.security.time.time", return_value=payload["exp"] + 1):
+        assert decode_token(token) is None
+
+
 def test_get_current_user_wrong_format(client: TestClient) -> None:
     """Test getting current user with wrong token format.
 
@@ -351,31 +278,24 @@ def test_register_with_disciplines(client: TestClient) -> None:
     assert data["disciplines"] == ["MARKETING", "BUSINESS"]
 
 
-def test_login_returns_disciplines(client: TestClient, session: Session) -> None:
+def test_login_returns_disciplines(
+    client: TestClient, session: Session, hashed_password: str
+) -> None:
     """Test that login returns disciplines field.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
-    # Create user with disciplines
-    user = User(
-        email="user@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("pass123"),
-        is_active=True,
-        is_approved=True,
-        disciplines=["SUPPLY_CHAIN", "HR"],
-    )
-    session.add(user)
-    session.commit()
+    create_user(session, hashed_password, disciplines=["SUPPLY_CHAIN", "HR"])
 
     # Login
     response = client.post(
         "/api/v1/auth/login",
         json={
             "email": "user@curtin.edu.au",
-            "password": "pass123",
+            "password": TEST_PASSWORD,
         },
     )
     assert response.status_code == 200
@@ -383,80 +303,44 @@ def test_login_returns_disciplines(client: TestClient, session: Session) -> None
     assert data["disciplines"] == ["SUPPLY_CHAIN", "HR"]
 
 
-def test_get_me_returns_disciplines(client: TestClient, session: Session) -> None:
+def test_get_me_returns_disciplines(
+    client: TestClient, session: Session, hashed_password: str
+) -> None:
     """Test that GET /me returns disciplines field.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
-    # Create user with disciplines
-    user = User(
-        email="user@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("pass123"),
-        is_active=True,
-        is_approved=True,
-        disciplines=["ACCOUNTING", "LAW"],
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    # Login to get token
-    login_response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "user@curtin.edu.au",
-            "password": "pass123",
-        },
-    )
-    token = login_response.json()["access_token"]
+    user = create_user(session, hashed_password, disciplines=["ACCOUNTING", "LAW"])
 
     # Get current user
     response = client.get(
         "/api/v1/auth/me",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers_for(user),
     )
     assert response.status_code == 200
     data = response.json()
     assert data["disciplines"] == ["ACCOUNTING", "LAW"]
 
 
-def test_patch_me_preserves_disciplines(client: TestClient, session: Session) -> None:
+def test_patch_me_preserves_disciplines(
+    client: TestClient, session: Session, hashed_password: str
+) -> None:
     """Test that PATCH /me preserves disciplines field.
 
     Args:
         client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
-    # Create user with disciplines
-    user = User(
-        email="user@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("pass123"),
-        is_active=True,
-        is_approved=True,
-        disciplines=["TOURISM"],
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
-    # Login to get token
-    login_response = client.post(
-        "/api/v1/auth/login",
-        json={
-            "email": "user@curtin.edu.au",
-            "password": "pass123",
-        },
-    )
-    token = login_response.json()["access_token"]
+    user = create_user(session, hashed_password, disciplines=["TOURISM"])
 
     # Update profile
     response = client.patch(
         "/api/v1/auth/me",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=auth_headers_for(user),
         json={"full_name": "Updated User"},
     )
     assert response.status_code == 200
@@ -0,0 +1,318 @@
+"""Tests for collections endpoints."""
+
+from uuid import UUID, uuid4
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.models import CollectionResource, Prompt, Resource, ResourceType, User
+from app.services.migrations import backfill_collection_members
+from tests.conftest import auth_headers_for, create_user
+
+
+@pytest.fixture
+def owner(session: Session, hashed_password: str) -> User:
+    """Create the user who owns the collections and their members.
+
+    Args:
+        session: Database session
+        hashed_password: Hash of TEST_PASSWORD
+
+    Returns:
+        Created user
+    """
+    return create_user(session, hashed_password, "owner@curtin.edu.au", "Owner")
+
+
+@pytest.fixture
+def resource_ids(session: Session, owner: User) -> list[UUID]:
+    """Insert three resources to collect.
+
+    Args:
+        session: Database session
+        owner: Resource author
+
+    Returns:
+        Resource IDs in insertion order
+    """
+    resources = [
+        Resource(
+            user_id=owner.id,
+            type=ResourceType.USE_CASE,
+            title=f"Use case {number}",
+            content_text="Content",
+        )
+        for number in range(3)
+    ]
+    session.add_all(resources)
+    session.commit()
+    return [resource.id for resource in resources]
+
+
+@pytest.fixture
+def prompt_ids(session: Session, owner: User) -> list[UUID]:
+    """Insert two prompts to collect.
+
+    Args:
+        session: Database session
+        owner: Prompt author
+
+    Returns:
+        Prompt IDs in insertion order
+    """
+    prompts = [
+        Prompt(user_id=owner.id, title=f"Prompt {number}", prompt_text="Text")
+        for number in range(2)
+    ]
+    session.add_all(prompts)
+    session.commit()
+    return [prompt.id for prompt in prompts]
+
+
+def _ids(values: list[UUID]) -> list[str]:
+    """Convert UUIDs to the strings used in request and response bodies."""
+    return [str(value) for value in values]
+
+
+def test_create_collection_keeps_member_order(
+    client: TestClient, owner: User, resource_ids: list[UUID], prompt_ids: list[UUID]
+) -> None:
+    """Test that members come back in request order, without duplicates.
+
+    Args:
+        client: Test client
+        owner: Collection owner
+        resource_ids: Resources to collect
+        prompt_ids: Prompts to collect
+    """
+    first, second, third = _ids(resource_ids)
+    response = client.post(
+        "/api/v1/collections",
+        json={
+            "name": "Favourites",
+            "resource_ids": [third, first, second, first],
+            "prompt_ids": _ids(prompt_ids[::-1]),
+        },
+        headers=auth_headers_for(owner),
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["resource_ids"] == [third, first, second]
+    assert data["prompt_ids"] == _ids(prompt_ids[::-1])
+    assert data["owner_id"] == str(owner.id)
+
+    response = client.get(f"/api/v1/collections/{data['id']}/resources")
+    assert response.json() == [third, first, second]
+    response = client.get(f"/api/v1/collections/{data['id']}/prompts")
+    assert response.json() == _ids(prompt_ids[::-1])
+
+
+@pytest.mark.parametrize("member_key", ["resource_ids", "prompt_ids"])
+def test_create_collection_rejects_unknown_members(
+    client: TestClient, owner: User, resource_ids: list[UUID], member_key: str
+) -> None:
+    """Test that unknown member IDs are a 400 and create nothing.
+
+    Args:
+        client: Test client
+        owner: Collection owner
+        resource_ids: Existing resources
+        member_key: Member list holding the unknown ID
+    """
+    unknown = str(uuid4())
+    body = {"name": "Broken", "resource_ids": _ids(resource_ids), member_key: [unknown]}
+
+    response = client.post("/api/v1/collections", json=body, headers=auth_headers_for(owner))
+
+    assert response.status_code == 400
+    assert unknown in response.json()["detail"]
+    assert client.get("/api/v1/collections").json() == []
+
+
+def test_update_collection_replaces_only_given_members(
+    client: TestClient, owner: User, resource_ids: list[UUID], prompt_ids: list[UUID]
+) -> None:
+    """Test that an update rewrites the given member list and keeps the other.
+
+    Args:
+        client: Test client
+        owner: Collection owner
+        resource_ids: Resources to collect
+        prompt_ids: Prompts to collect
+    """
+    headers = auth_headers_for(owner)
+    collection_id = client.post(
+        "/api/v1/collections",
+        json={"name": "Mixed", "resource_ids": _ids(resource_ids), "prompt_ids": _ids(prompt_ids)},
+        headers=headers,
+    ).json()["id"]
+
+    response = client.patch(
+        f"/api/v1/collections/{collection_id}",
+        json={"resource_ids": _ids([resource_ids[2], resource_ids[0]])},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["resource_ids"] == _ids([resource_ids[2], resource_ids[0]])
+    assert response.json()["prompt_ids"] == _ids(prompt_ids)
+
+
+def test_update_collection_rejects_unknown_members(
+    client: TestClient, owner: User, resource_ids: list[UUID]
+) -> None:
+    """Test that an update with an unknown member is a 400 and changes nothing.
+
+    Args:
+        client: Test client
+        owner: Collection owner
+        resource_ids: Resources to collect
+    """
+    headers = auth_headers_for(owner)
+    collection_id = client.post(
+        "/api/v1/collections",
+        json={"name": "Stable", "resource_ids": _ids(resource_ids)},
+        headers=headers,
+    ).json()["id"]
+
+    response = client.patch(
+        f"/api/v1/collections/{collection_id}",
+        json={"name": "Renamed", "prompt_ids": [str(uuid4())]},
+        headers=headers,
+    )
+
+    assert response.status_code == 400
+    data = client.get(f"/api/v1/collections/{collection_id}").json()
+    assert data["name"] == "Stable"
+    assert data["resource_ids"] == _ids(resource_ids)
+    assert data["prompt_ids"] == []
+
+
+def test_list_collections_includes_members(
+    client: TestClient, owner: User, resource_ids: list[UUID], prompt_ids: list[UUID]
+) -> None:
+    """Test that every listed collection carries its own members.
+
+    Args:
+        client: Test client
+        owner: Collection owner
+        resource_ids: Resources to collect
+        prompt_ids: Prompts to collect
+    """
+    headers = auth_headers_for(owner)
+    client.post(
+        "/api/v1/collections",
+        json={"name": "Resources", "resource_ids": _ids(resource_ids[:2])},
+        headers=headers,
+    )
+    client.post(
+        "/api/v1/collections",
+        json={"name": "Prompts", "prompt_ids": _ids(prompt_ids)},
+        headers=headers,
+    )
+    client.post("/api/v1/collections", json={"name": "Empty"}, headers=headers)
+
+    response = client.get("/api/v1/collections")
+
+    assert response.status_code == 200
+    members = {data["name"]: (data["resource_ids"], data["prompt_ids"]) for data in response.json()}
+    assert members == {
+        "Resources": (_ids(resource_ids[:2]), []),
+        "Prompts": ([], _ids(prompt_ids)),
+        "Empty": ([], []),
+    }
+
+
+def test_delete_collection_removes_links(
+    client: TestClient, session: Session, owner: User, resource_ids: list[UUID]
+) -> None:
+    """Test that deleting a collection deletes its link rows too.
+
+    Args:
+        client: Test client
+        session: Database session
+        owner: Collection owner
+        resource_ids: Resources to collect
+    """
+    headers = auth_headers_for(owner)
+    collection_id = client.post(
+        "/api/v1/collections",
+        json={"name": "Doomed", "resource_ids": _ids(resource_ids)},
+        headers=headers,
+    ).json()["id"]
+
+    response = client.delete(f"/api/v1/collections/{collection_id}", headers=headers)
+
+    assert response.status_code == 204
+    assert client.get(f"/api/v1/collections/{collection_id}").status_code == 404
+    assert session.exec(select(CollectionResource)).all() == []
+
+
+def test_delete_resource_removes_it_from_collections(
+    client: TestClient, owner: User, resource_ids: list[UUID]
+) -> None:
+    """Test that a deleted resource drops out of collections (no FK cascade on SQLite).
+
+    Args:
+        client: Test client
+        owner: Collection and resource owner
+        resource_ids: Resources to collect
+    """
+    headers = auth_headers_for(owner)
+    collection_id = client.post(
+        "/api/v1/collections",
+        json={"name": "Shrinking", "resource_ids": _ids(resource_ids)},
+        headers=headers,
+    ).json()["id"]
+
+    response = client.delete(f"/api/v1/resources/{resource_ids[1]}", headers=headers)
+
+    assert response.status_code == 204
+    response = client.get(f"/api/v1/collections/{collection_id}/resources")
+    assert response.json() == _ids([resource_ids[0], resource_ids[2]])
+
+
+def test_backfill_collection_members(
+    client: TestClient,
+    session: Session,
+    owner: User,
+    resource_ids: list[UUID],
+    prompt_ids: list[UUID],
+) -> None:
+    """Test moving members from the old JSON columns into the link tables.
+
+    Args:
+        client: Test client
+        session: Database session
+        owner: Collection owner
+        resource_ids: Resources referenced by the old column
+        prompt_ids: Prompts referenced by the old column
+    """
+    collection_id = client.post(
+        "/api/v1/collections", json={"name": "Legacy"}, headers=auth_headers_for(owner)
+    ).json()["id"]
+
+    # Recreate the pre-link-table columns, including an ID that no longer exists
+    connection = session.connection()
+    old_members = {
+        "resource_ids": [resource_ids[2], uuid4(), resource_ids[0]],
+        "prompt_ids": prompt_ids[::-1],
+    }
+    for column, member_ids in old_members.items():
+        connection.execute(text(f"ALTER TABLE collection ADD COLUMN {column} JSON"))
+        connection.execute(
+            text(f"UPDATE collection SET {column} = :members"),
+            {"members": orjson.dumps(member_ids).decode()},
+        )
+
+    assert backfill_collection_members(connection) == 4
+    # The old columns are dropped, so a second run does nothing
+    assert backfill_collection_members(connection) == 0
+
+    data = client.get(f"/api/v1/collections/{collection_id}").json()
+    assert data["resource_ids"] == _ids([resource_ids[2], resource_ids[0]])
+    assert data["prompt_ids"] == _ids(prompt_ids[::-1])
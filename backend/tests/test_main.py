@@ -25,3 +25,74 @@ def test_api_root(client: TestClient) -> None:
     data = response.json()
     assert "message" in data
     assert "Welcome to The AI Exchange" in data["message"]
+
+
+def test_cors_preflight_allowed_origin(client: TestClient) -> None:
+    """Test that preflight requests from an allowed origin are answered.
+
+    Args:
+        client: Test client
+    """
+    response = client.options(
+        "/api/v1/resources",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization,content-type",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert "authorization" in response.headers["access-control-allow-headers"]
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-max-age"] == "86400"
+
+
+def test_cors_preflight_disallowed_origin(client: TestClient) -> None:
+    """Test that preflight requests from an unknown origin are rejected.
+
+    Args:
+        client: Test client
+    """
+    response = client.options(
+        "/api/v1/resources",
+        headers={
+            "Origin": "http://evil.example.com",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_cors_preflight_disallowed_header(client: TestClient) -> None:
+    """Test that preflight requests asking for unlisted headers are rejected.
+
+    Args:
+        client: Test client
+    """
+    response = client.options(
+        "/api/v1/resources",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "x-custom-header",
+        },
+    )
+    assert response.status_code == 400
+
+
+def test_cors_simple_request_headers(client: TestClient) -> None:
+    """Test that CORS headers are added only for allowed origins.
+
+    Args:
+        client: Test client
+    """
+    response = client.get("/health", headers={"Origin": "http://localhost:3000"})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+    response = client.get("/health", headers={"Origin": "http://evil.example.com"})
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
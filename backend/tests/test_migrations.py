@@ -0,0 +1,53 @@
+"""Tests for upgrading databases created from an older schema."""
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel, select
+
+from app.models import Resource, ResourceType, Subscription, UserSavedResource, UserTriedResource
+from app.services.migrations import UNIQUE_INDEXES, ensure_unique_indexes
+from tests.conftest import create_user
+
+
+@pytest.mark.parametrize(
+    ("index_name", "model"),
+    [
+        pytest.param("uq_subscription_user_tag", Subscription, id="subscription"),
+        pytest.param("uq_saved_user_resource", UserSavedResource, id="saved"),
+        pytest.param("uq_tried_user_resource", UserTriedResource, id="tried"),
+    ],
+)
+def test_ensure_unique_indexes_dedupes_and_creates_index(
+    session: Session, hashed_password: str, index_name: str, model: type[SQLModel]
+) -> None:
+    """Test that duplicate rows are removed and the missing index is created.
+
+    Args:
+        session: Database session
+        hashed_password: Hash of TEST_PASSWORD
+        index_name: Unique index to drop and restore
+        model: Model of the indexed table
+    """
+    table, columns = UNIQUE_INDEXES[index_name]
+    user = create_user(session, hashed_password)
+    resource = Resource(
+        user_id=user.id, type=ResourceType.USE_CASE, title="Use case", content_text="Content"
+    )
+    session.add(resource)
+    session.commit()
+    values = {"user_id": user.id, "resource_id": resource.id, "tag": "marketing"}
+    row = {column: values[column] for column in columns}
+
+    # Start from the older schema: no index, and the same row stored twice
+    session.exec(text(f"DROP INDEX {index_name}"))  # type: ignore[call-overload]
+    session.add_all([model(**row), model(**row)])
+    session.commit()
+
+    ensure_unique_indexes(session.connection())
+    # Running it again is a no-op
+    ensure_unique_indexes(session.connection())
+
+    assert len(session.exec(select(model)).all()) == 1
+    indexes = {index["name"]: index for index in inspect(session.connection()).get_indexes(table)}
+    assert indexes[index_name]["column_names"] == list(columns)
+    assert indexes[index_name]["unique"]
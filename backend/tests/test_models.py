@@ -1,106 +1,116 @@
 """Tests for database models."""
 
 
+import time
+
+import pytest
 from sqlmodel import Session
 
-from app.core.security import hash_password
-from app.models import Resource, ResourceStatus, ResourceType, User, UserRole
+from app.models import (
+    Resource,
+    ResourceListItem,
+    ResourceResponse,
+    ResourceStatus,
+    ResourceType,
+    ResourceWithAuthor,
+    User,
+    UserRole,
+    uuid7,
+)
+from tests.conftest import create_user
+
+
+@pytest.fixture
+def author(session: Session, hashed_password: str) -> User:
+    """Insert a staff user to author resources.
+
+    The models declare no relationships, so the unit of work does not know
+    to insert users before the resources that reference them; the author is
+    committed here so a test's resources can follow in a single flush.
 
+    Args:
+        session: Database session
+        hashed_password: Shared password hash
 
-def test_create_user(session: Session) -> None:
-    """Test creating a user.
+    Returns:
+        Created user
+    """
+    return create_user(session, hashed_password, "author@curtin.edu.au", "Author")
+
+
+@pytest.mark.parametrize(
+    ("role", "email", "full_name"),
+    [
+        pytest.param(UserRole.STAFF, "test@curtin.edu.au", "Test User", id="staff"),
+        pytest.param(UserRole.ADMIN, "admin@curtin.edu.au", "Admin User", id="admin"),
+    ],
+)
+def test_create_user(
+    session: Session,
+    hashed_password: str,
+    role: UserRole,
+    email: str,
+    full_name: str,
+) -> None:
+    """Test creating a user with each role.
 
     Args:
         session: Database session
+        hashed_password: Shared password hash
+        role: User role
+        email: User email
+        full_name: User full name
     """
     user = User(
-        email="test@curtin.edu.au",
-        full_name="Test User",
-        hashed_password=hash_password("testpass123"),  # Max 72 bytes for bcrypt
-        role=UserRole.STAFF,
+        email=email,
+        full_name=full_name,
+        hashed_password=hashed_password,
+        role=role,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    session.flush()
 
     assert user.id is not None
-    assert user.email == "test@curtin.edu.au"
-    assert user.full_name == "Test User"
-    assert user.role == UserRole.STAFF
+    assert user.email == email
+    assert user.full_name == full_name
+    assert user.role == role
     assert user.is_active is True
     assert user.is_approved is True
 
 
-def test_create_admin_user(session: Session) -> None:
-    """Test creating an admin user.
-
-    Args:
-        session: Database session
-    """
-    admin = User(
-        email="admin@curtin.edu.au",
-        full_name="Admin User",
-        hashed_password=hash_password("admin123"),  # Max 72 bytes for bcrypt
-        role=UserRole.ADMIN,
-    )
-    session.add(admin)
-    session.commit()
-    session.refresh(admin)
-
-    assert admin.role == UserRole.ADMIN
-    assert admin.is_active is True
-
-
-def test_create_resource(session: Session) -> None:
+def test_create_resource(session: Session, author: User) -> None:
     """Test creating a resource.
 
     Args:
         session: Database session
+        author: Resource author
     """
-    user = User(
-        email="author@curtin.edu.au",
-        full_name="Author",
-        hashed_password=hash_password("pass123"),  # Max 72 bytes for bcrypt
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
     resource = Resource(
-        user_id=user.id,
+        user_id=author.id,
         type=ResourceType.REQUEST,
         title="How to use ChatGPT for marketing?",
         content_text="I want to learn how to use ChatGPT effectively...",
         is_anonymous=False,
     )
     session.add(resource)
-    session.commit()
-    session.refresh(resource)
+    session.flush()
 
     assert resource.id is not None
-    assert resource.user_id == user.id
+    assert resource.user_id == author.id
     assert resource.type == ResourceType.REQUEST
     assert resource.status == ResourceStatus.OPEN
     assert resource.is_anonymous is False
 
 
-def test_resource_with_tags(session: Session) -> None:
+def test_resource_with_tags(session: Session, author: User) -> None:
     """Test creating a resource with tags.
 
     Args:
         session: Database session
+        author: Resource author
     """
-    user = User(
-        email="author@curtin.edu.au",
-        full_name="Author",
-        hashed_password=hash_password("pass123"),  # Max 72 bytes for bcrypt
-    )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-
     resource = Resource(
-        user_id=user.id,
+        user_id=author.id,
         type=ResourceType.PROMPT,
         title="Marketing Analytics Prompt",
         content_text="Use this prompt for analyzing customer data...",
@@ -108,56 +118,63 @@ def test_resource_with_tags(session: Session) -> None:
         user_tags=["Segmentation"],
     )
     session.add(resource)
-    session.commit()
-    session.refresh(resource)
+    session.flush()
 
     assert resource.system_tags == ["ChatGPT", "Marketing", "Analytics"]
     assert resource.user_tags == ["Segmentation"]
-    assert len(resource.all_tags) == 4
+
+    # all_tags builds a new deduplicated list on every access; read it once
+    all_tags = resource.all_tags
+    assert len(all_tags) == 4
+    assert set(all_tags) == {"ChatGPT", "Marketing", "Analytics", "Segmentation"}
 
 
-def test_solution_to_request(session: Session) -> None:
+def test_solution_to_request(session: Session, author: User, hashed_password: str) -> None:
     """Test creating a solution to a request.
 
     Args:
         session: Database session
+        author: Request author
+        hashed_password: Shared password hash
     """
-    user1 = User(
-        email="user1@curtin.edu.au",
-        full_name="User 1",
-        hashed_password=hash_password("pass123"),  # Max 72 bytes for bcrypt
-    )
-    user2 = User(
-        email="user2@curtin.edu.au",
-        full_name="User 2",
-        hashed_password=hash_password("pass123"),  # Max 72 bytes for bcrypt
-    )
-    session.add(user1)
-    session.add(user2)
-    session.commit()
+    solver = create_user(session, hashed_password, "solver@curtin.edu.au", "Solver")
 
     # Create request
     request = Resource(
-        user_id=user1.id,
+        user_id=author.id,
         type=ResourceType.REQUEST,
         title="Need help with customer segmentation",
         content_text="Looking for AI tools for customer segmentation...",
     )
-    session.add(request)
-    session.commit()
-    session.refresh(request)
 
     # Create solution
     solution = Resource(
-        user_id=user2.id,
+        user_id=solver.id,
         parent_id=request.id,
         type=ResourceType.USE_CASE,
         title="Used ChatGPT for segmentation",
         content_text="Here's how I used ChatGPT to segment customers...",
     )
-    session.add(solution)
-    session.commit()
-    session.refresh(solution)
+    # Request and solution go in one batched INSERT, in this order
+    session.add_all([request, solution])
+    session.flush()
 
     assert solution.parent_id == request.id
     assert solution.type == ResourceType.USE_CASE
+
+
+def test_uuid7_is_time_ordered() -> None:
+    """Test that resource keys are version 7 UUIDs that sort by creation time."""
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+
+    assert first.version == 7
+    assert first < second
+    assert first.hex < second.hex
+
+
+def test_response_schemas_built_at_import() -> None:
+    """Test that schemas with forward references are fully built on import."""
+    for schema in (ResourceResponse, ResourceWithAuthor, ResourceListItem):
+        assert schema.__pydantic_complete__
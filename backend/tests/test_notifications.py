@@ -1,9 +1,17 @@
 """Tests for email notification system."""
 
+import smtplib
+from email.message import Message
+from typing import Any
+
 import pytest
+import requests
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.core.config import settings
+from app.services import email_provider
+from app.services.email_provider import CurtinEmailProvider, SendGridEmailProvider
 from app.services.email_service import clear_email_log, get_email_log
 
 
@@ -302,3 +310,91 @@ def test_multiple_subscribers_basic(
         subs = response.json()
         assert len(subs) == 1
         assert subs[0]["tag"] == "machine"
+
+
+def test_smtp_provider_sends_batch_over_one_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a batch opens one SMTP connection and skips failed recipients.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    connections: list["FakeSMTP"] = []
+
+    class FakeSMTP:
+        def __init__(self, *_args: object) -> None:
+            self.sent: list[str] = []
+            self.closed = False
+            connections.append(self)
+
+        def starttls(self, **_kwargs: object) -> None:
+            pass
+
+        def send_message(self, msg: Message) -> None:
+            if msg["To"] == "bounce@curtin.edu.au":
+                raise smtplib.SMTPRecipientsRefused({})
+            assert msg.get_content_type() == "text/html"
+            self.sent.append(msg["To"])
+
+        def __enter__(self) -> "FakeSMTP":
+            return self
+
+        def __exit__(self, *_exc: object) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+
+    results = CurtinEmailProvider().send_bulk(
+        [
+            ("one@curtin.edu.au", "Subject", "Body"),
+            ("bounce@curtin.edu.au", "Subject", "Body"),
+            ("two@curtin.edu.au", "Subject", "Body"),
+        ]
+    )
+
+    assert results == [True, False, True]
+    assert len(connections) == 1
+    assert connections[0].sent == ["one@curtin.edu.au", "two@curtin.edu.au"]
+    assert connections[0].closed
+
+
+def test_sendgrid_provider_shares_one_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that SendGrid creates one HTTP session and posts single emails inline.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    sessions: list["FakeSession"] = []
+
+    class FakeResponse:
+        status_code = 202
+
+    class FakeSession:
+        def __init__(self) -> None:
+            self.posted: list[str] = []
+            sessions.append(self)
+
+        def mount(self, *_args: object) -> None:
+            pass
+
+        def post(self, _url: str, json: dict[str, Any], **_kwargs: object) -> FakeResponse:
+            self.posted.append(json["personalizations"][0]["to"][0]["email"])
+            return FakeResponse()
+
+    def no_thread_pool(*_args: object, **_kwargs: object) -> None:
+        raise AssertionError("a single email must not start a thread pool")
+
+    monkeypatch.setattr(settings, "sendgrid_api_key", "test-key")
+    monkeypatch.setattr(requests, "Session", FakeSession)
+    monkeypatch.setattr(SendGridEmailProvider, "_session", None)
+    provider = SendGridEmailProvider()
+
+    with monkeypatch.context() as mp:
+        mp.setattr(email_provider, "ThreadPoolExecutor", no_thread_pool)
+        assert provider.send_bulk([("one@curtin.edu.au", "Subject", "Body")]) == [True]
+
+    recipients = [f"user{i}@curtin.edu.au" for i in range(20)]
+    results = provider.send_bulk([(to_email, "Subject", "Body") for to_email in recipients])
+
+    assert results == [True] * 20
+    assert len(sessions) == 1
+    assert sorted(sessions[0].posted) == sorted(["one@curtin.edu.au", *recipients])
@@ -4,29 +4,25 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app.api import resources
+from app.api.resources import process_new_resource
+from app.models import Resource, ResourceType, Subscription
+from app.services.email_service import clear_email_log, get_email_log
+from tests.conftest import auth_headers_for, create_user
+
 
 @pytest.fixture
-def auth_headers(client: TestClient, session: Session) -> dict[str, str]:  # noqa: ARG001
+def auth_headers(session: Session, hashed_password: str) -> dict[str, str]:
     """Create authenticated user and return auth headers.
 
     Args:
-        client: Test client
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
 
     Returns:
         Authorization headers
     """
-    # Register user
-    response = client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "user@curtin.edu.au",
-            "full_name": "Test User",
-            "password": "testpass123",
-        },
-    )
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for(create_user(session, hashed_password))
 
 
 def test_create_request(client: TestClient, auth_headers: dict[str, str]) -> None:
@@ -52,7 +48,10 @@ def test_create_request(client: TestClient, auth_headers: dict[str, str]) -> Non
     assert data["title"] == "How to use ChatGPT for marketing?"
     assert data["status"] == "OPEN"
     assert data["is_anonymous"] is False
-    assert len(data["system_tags"]) > 0  # Should have auto-generated tags
+
+    # Tags are auto-generated by a background task after the response is sent
+    get_response = client.get(f"/api/v1/resources/{data['id']}", headers=auth_headers)
+    assert len(get_response.json()["system_tags"]) > 0
 
 
 def test_create_anonymous_request(
@@ -237,6 +236,96 @@ def test_list_resources(client: TestClient, auth_headers: dict[str, str]) -> Non
     assert len(data) >= 3
 
 
+def test_list_resources_with_professional_roles_filter(
+    client: TestClient,
+    session: Session,
+    hashed_password: str,
+) -> None:
+    """Test filtering resources by the creator's professional roles.
+
+    Args:
+        client: Test client
+        session: Database session
+        hashed_password: Hash of TEST_PASSWORD
+    """
+    educator = create_user(
+        session,
+        hashed_password,
+        "educator@curtin.edu.au",
+        "Educator",
+        professional_roles=["Educator"],
+    )
+    researcher = create_user(
+        session,
+        hashed_password,
+        "researcher@curtin.edu.au",
+        "Researcher",
+        professional_roles=["Researcher", "Professional"],
+    )
+
+    for author in (educator, researcher):
+        session.add(
+            Resource(
+                user_id=author.id,
+                type=ResourceType.PROMPT,
+                title=f"Prompt by {author.full_name}",
+                content_text="Content",
+            )
+        )
+    session.commit()
+
+    response = client.get("/api/v1/resources?professional_roles=Researcher")
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["title"] for r in data] == ["Prompt by Researcher"]
+    assert data[0]["author_name"] == "Researcher"
+    assert data[0]["analytics"] is None
+
+    response = client.get("/api/v1/resources?professional_roles=Educator,Professional")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    # Roles match whole list elements; LIKE wildcards and substrings match nothing
+    for role in ("%25", "Educat_r", "Educ"):
+        response = client.get(f"/api/v1/resources?professional_roles={role}")
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+def test_list_resources_with_tag_filter(
+    client: TestClient, session: Session, hashed_password: str
+) -> None:
+    """Test that tag filtering matches whole tags in any tag list.
+
+    Args:
+        client: Test client
+        session: Database session
+        hashed_password: Hash of TEST_PASSWORD
+    """
+    author = create_user(session, hashed_password, "tagger@curtin.edu.au", "Tagger")
+
+    for title, system_tags, shadow_tags in (
+        ("Multi-tag", ["marketing", "ai"], []),
+        ("Shadow-tag", [], ["marketing"]),
+        ("Substring", ["email marketing"], []),
+    ):
+        session.add(
+            Resource(
+                user_id=author.id,
+                type=ResourceType.PROMPT,
+                title=title,
+                content_text="Content",
+                system_tags=system_tags,
+                shadow_tags=shadow_tags,
+            )
+        )
+    session.commit()
+
+    response = client.get("/api/v1/resources?tag=marketing")
+    assert response.status_code == 200
+    assert sorted(r["title"] for r in response.json()) == ["Multi-tag", "Shadow-tag"]
+
+
 def test_list_resources_with_type_filter(
     client: TestClient,
     auth_headers: dict[str, str],
@@ -352,7 +441,8 @@ def test_update_resource(
 def test_update_resource_not_owner(
     client: TestClient,
     auth_headers: dict[str, str],
-    session: Session,  # noqa: ARG001
+    session: Session,
+    hashed_password: str,
 ) -> None:
     """Test that non-owner cannot update resource.
 
@@ -360,6 +450,7 @@ def test_update_resource_not_owner(
         client: Test client
         auth_headers: Authorization headers
         session: Database session
+        hashed_password: Hash of TEST_PASSWORD
     """
     # Create resource with first user
     create_response = client.post(
@@ -374,17 +465,9 @@ def test_update_resource_not_owner(
     )
     resource_id = create_response.json()["id"]
 
-    # Register second user
-    response = client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "other@curtin.edu.au",
-            "full_name": "Other User",
-            "password": "otherpass123",
-        },
-    )
-    other_token = response.json()["access_token"]
-    other_headers = {"Authorization": f"Bearer {other_token}"}
+    # Create second user
+    other = create_user(session, hashed_password, "other@curtin.edu.au", "Other User")
+    other_headers = auth_headers_for(other)
 
     # Try to update with second user
     response = client.patch(
@@ -480,3 +563,56 @@ def test_get_solutions(
     data = response.json()
     assert len(data) == 2
     assert all(item["parent_id"] == request_id for item in data)
+
+
+def test_process_new_resource_tags_and_notifies_subscribers(
+    session: Session,
+    hashed_password: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the background task tags a request and emails opted-in subscribers.
+
+    Args:
+        session: Database session
+        hashed_password: Hash of TEST_PASSWORD
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    monkeypatch.setattr(resources, "extract_keywords", lambda _text: ["marketing", "analytics"])
+
+    author = create_user(session, hashed_password, "author@curtin.edu.au", "Author")
+    subscriber = create_user(session, hashed_password, "subscriber@curtin.edu.au", "Subscriber")
+    opted_out = create_user(
+        session,
+        hashed_password,
+        "optout@curtin.edu.au",
+        "Opted Out",
+        notification_prefs={"notify_requests": False, "notify_solutions": False},
+    )
+    unrelated = create_user(session, hashed_password, "unrelated@curtin.edu.au", "Unrelated")
+
+    request = Resource(
+        user_id=author.id,
+        type=ResourceType.REQUEST,
+        title="Marketing analytics with AI",
+        content_text="How do I analyse campaign data?",
+    )
+    session.add_all(
+        [
+            request,
+            # Matches both tags, but must only be emailed once
+            Subscription(user_id=subscriber.id, tag="marketing"),
+            Subscription(user_id=subscriber.id, tag="analytics"),
+            Subscription(user_id=opted_out.id, tag="marketing"),
+            Subscription(user_id=unrelated.id, tag="finance"),
+        ]
+    )
+    session.commit()
+    clear_email_log()
+
+    process_new_resource(session.get_bind(), request.id)
+
+    session.refresh(request)
+    assert request.system_tags == ["marketing", "analytics"]
+    email_log = get_email_log()
+    assert [email["to"] for email in email_log] == ["subscriber@curtin.edu.au"]
+    assert email_log[0]["type"] == "new_request"